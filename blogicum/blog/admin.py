@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import (
+    AuthorStats, Category, Comment, ImageJob, Location, Post
+)
+from .search import search_posts
 
 
 class CommentInline(admin.TabularInline):
@@ -23,6 +26,7 @@ class PostAdmin(admin.ModelAdmin):
         'location',
         'category',
         'created_at',
+        'comment_count',
         'is_published',
     )
     list_editable = ('is_published',)
@@ -34,6 +38,11 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     empty_value_display = 'Не задано'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -82,3 +91,28 @@ class CommentAdmin(admin.ModelAdmin):
     )
     list_filter = ('pub_date',)
     search_fields = ('text',)
+
+
+@admin.register(AuthorStats)
+class AuthorStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'user',
+        'post_count',
+        'comment_count',
+        'last_activity_at',
+    )
+    readonly_fields = list_display
+    search_fields = ('user__username',)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'image_name',
+        'post',
+        'created_at',
+        'started_at',
+        'attempts',
+        'error',
+    )
+    list_filter = ('created_at',)
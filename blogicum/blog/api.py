@@ -0,0 +1,199 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.generic import View
+
+from .lookups import get_category_by_slug
+from .models import Comment, Post
+from .pagination import CursorPaginator, InvalidCursor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+# API field name: (model fields to load, function returning the value).
+POST_FIELDS = {
+    'id': ((), lambda post: post.pk),
+    'title': (('title',), lambda post: post.title),
+    'text': (('text',), lambda post: post.text),
+    'pub_date': (('pub_date',), lambda post: post.pub_date),
+    'author': (('author__username',), lambda post: post.author.username),
+    'category': (
+        ('category',),
+        lambda post: post.category.slug if post.category_id else None,
+    ),
+    'location': (
+        ('location',),
+        lambda post: (
+            post.location.name
+            if post.location_id and post.location.is_published else None
+        ),
+    ),
+    'image': (('image',), lambda post: post.image.url if post.image else None),
+    'comment_count': (('comment_count',), lambda post: post.comment_count),
+}
+COMMENT_FIELDS = {
+    'id': ((), lambda comment: comment.pk),
+    'text': (('text',), lambda comment: comment.text),
+    'pub_date': (('pub_date',), lambda comment: comment.pub_date),
+    'author': (
+        ('author__username',), lambda comment: comment.author.username
+    ),
+}
+
+
+class ApiError(Exception):
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_fields(value, available):
+    if not value:
+        return list(available)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+    return fields
+
+
+def select_fields(queryset, fields, available):
+    """Load only the columns the requested fields need."""
+    columns = {'pub_date'}
+    for name in fields:
+        columns.update(available[name][0])
+    if any(column.startswith('author__') for column in columns):
+        queryset = queryset.select_related('author')
+    return queryset.only(*columns)
+
+
+def serialize(obj, fields, available):
+    return {name: available[name][1](obj) for name in fields}
+
+
+class ApiView(View):
+
+    def get_fields(self, parameter='fields', available=POST_FIELDS):
+        return parse_fields(self.request.GET.get(parameter), available)
+
+    def get_page_url(self, url, **cursor):
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query.update(cursor)
+        return f'{url}?{query.urlencode()}'
+
+    def paginate(self, queryset, fields, available, url, newest_first=True):
+        paginator = CursorPaginator(
+            queryset, settings.API_PAGE_SIZE, newest_first=newest_first
+        )
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise ApiError('Неверный курсор страницы.')
+        return {
+            'results': [serialize(obj, fields, available) for obj in page],
+            'next': (
+                self.get_page_url(url, after=page.next_cursor)
+                if page.has_next() else None
+            ),
+            'previous': (
+                self.get_page_url(url, before=page.previous_cursor)
+                if page.has_previous() else None
+            ),
+        }
+
+    def get_post_queryset(self):
+        return Post.objects.with_lookups().visible_to(self.request.user)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            data = super().dispatch(request, *args, **kwargs)
+            status = 200
+        except ApiError as error:
+            data, status = {'error': str(error)}, error.status
+        except Http404:
+            data, status = {'error': 'Не найдено.'}, 404
+        if isinstance(data, HttpResponse):
+            return data
+        return HttpResponse(
+            dumps(data), status=status, content_type='application/json'
+        )
+
+
+class PostListApiView(ApiView):
+
+    def get(self, request):
+        fields = self.get_fields()
+        queryset = self.get_post_queryset()
+        if request.GET.get('category'):
+            category = get_category_by_slug(request.GET['category'])
+            queryset = (
+                queryset.filter(category_id=category.pk)
+                if category else queryset.none()
+            )
+        if request.GET.get('author'):
+            queryset = queryset.filter(
+                author__username=request.GET['author']
+            )
+        queryset = select_fields(queryset, fields, POST_FIELDS)
+        return self.paginate(
+            queryset, fields, POST_FIELDS, reverse('blog:api_posts')
+        )
+
+
+class PostCommentsMixin:
+
+    def get_comments(self, post_id):
+        fields = self.get_fields('comment_fields', COMMENT_FIELDS)
+        queryset = select_fields(
+            Comment.objects.filter(post_id=post_id), fields, COMMENT_FIELDS
+        )
+        return self.paginate(
+            queryset,
+            fields,
+            COMMENT_FIELDS,
+            reverse('blog:api_post_comments', kwargs={'pk': post_id}),
+            newest_first=False,
+        )
+
+
+class PostDetailApiView(PostCommentsMixin, ApiView):
+
+    def get(self, request, pk):
+        fields = self.get_fields()
+        post = select_fields(
+            self.get_post_queryset().filter(pk=pk), fields, POST_FIELDS
+        ).first()
+        if post is None:
+            raise Http404
+        return {
+            **serialize(post, fields, POST_FIELDS),
+            'comments': self.get_comments(pk),
+        }
+
+
+class PostCommentListApiView(PostCommentsMixin, ApiView):
+
+    def get(self, request, pk):
+        if not self.get_post_queryset().filter(pk=pk).exists():
+            raise Http404
+        return self.get_comments(pk)
@@ -0,0 +1,246 @@
+import hashlib
+import logging
+import math
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from .lookups import get_lookup_tables
+from .models import Post, PostVisibility
+
+ALL_FEEDS = '*'
+
+logger = logging.getLogger(__name__)
+
+# What a post contributes to the cached post counts: the feeds it is in,
+# whether readers other than its author see it, and whether they will once
+# its publication date comes.
+PostState = namedtuple(
+    'PostState',
+    ('category_slug', 'author_username', 'is_visible', 'is_scheduled'),
+)
+
+
+def feed_scope(**filters):
+    return '&'.join(f'{key}={value}' for key, value in sorted(filters.items()))
+
+
+def get_feed_generations(scope):
+    """Return the generations of all feeds and of the given feed.
+
+    A generation is the time in nanoseconds of the last change. A missing
+    generation (for example, after the cache was cleared) starts at the
+    current time, never at a value a client may already have seen in an
+    ETag.
+    """
+    keys = (f'feed_gen:{ALL_FEEDS}', f'feed_gen:{scope}')
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        generations.update(cache.get_many(missing))
+    return tuple(generations.get(key, 0) for key in keys)
+
+
+def get_post_card_version():
+    return get_feed_generations(feed_scope())[0]
+
+
+def bump_feed_generation(scope=ALL_FEEDS):
+    cache.set(f'feed_gen:{scope}', time.time_ns(), timeout=None)
+
+
+def get_post_feed_keys(post_id):
+    return (
+        Post.objects
+        .filter(pk=post_id)
+        .values_list('category__slug', 'author__username')
+        .first()
+    )
+
+
+def bump_post_page(post_id):
+    bump_feed_generation(feed_scope(post_id=post_id))
+
+
+def bump_post_feeds(category_slug, author_username):
+    bump_feed_generation(feed_scope())
+    if category_slug:
+        bump_feed_generation(feed_scope(category__slug=category_slug))
+    if author_username:
+        bump_feed_generation(feed_scope(author__username=author_username))
+
+
+def make_post_state(category_slug, category_is_published, author_username,
+                    visibility):
+    is_listed = bool(category_is_published)
+    return PostState(
+        category_slug,
+        author_username,
+        is_listed and visibility == PostVisibility.VISIBLE,
+        is_listed and visibility == PostVisibility.SCHEDULED,
+    )
+
+
+def get_post_state(post_id):
+    row = (
+        Post.objects
+        .filter(pk=post_id)
+        .values_list(
+            'category__slug', 'category__is_published', 'author__username',
+            'visibility',
+        )
+        .first()
+    )
+    return row and make_post_state(*row)
+
+
+def get_post_count_key(scope, audience='public'):
+    """Key of the cached number of posts in a feed.
+
+    ``audience`` is ``'public'``, or ``'own'`` for an author's profile seen
+    by the author, who also sees their unpublished posts. Changes to
+    categories reload the lookup tables, which starts new counts.
+    """
+    digest = hashlib.md5(scope.encode()).hexdigest()
+    version = get_lookup_tables().version
+    return f'post_count:{version}:{audience}:{digest}'
+
+
+def get_public_feed_scopes(state):
+    scopes = [
+        feed_scope(),
+        feed_scope(author__username=state.author_username),
+    ]
+    if state.category_slug:
+        scopes.append(feed_scope(category__slug=state.category_slug))
+    return scopes
+
+
+def adjust_post_counts(previous, current):
+    """Update cached counts after a post changed from one state to another.
+
+    Counts that are not cached are left alone: they are counted on the next
+    request. Counts of the feeds a scheduled post will appear in are
+    dropped, so they are next cached only until it goes live.
+    """
+    deltas = Counter()
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+        author_scope = feed_scope(author__username=state.author_username)
+        deltas[author_scope, 'own'] += sign
+        if state.is_visible:
+            for scope in get_public_feed_scopes(state):
+                deltas[scope, 'public'] += sign
+    for (scope, audience), delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(get_post_count_key(scope, audience), delta)
+        except ValueError:
+            pass
+    if current is not None and current.is_scheduled:
+        cache.delete_many([
+            get_post_count_key(scope)
+            for scope in get_public_feed_scopes(current)
+        ])
+
+
+def get_feed_page_key(scope, path):
+    digest = hashlib.md5(f'{scope}|{path}'.encode()).hexdigest()
+    generations = '.'.join(map(str, get_feed_generations(scope)))
+    return f'feed_page:{generations}:{digest}'
+
+
+def get_next_publication(**filters):
+    """Return when the next scheduled post in the feed becomes visible.
+
+    Read from the primary: the answer is cached for as long as the feed
+    does not change, so a lagging replica's answer would stick.
+    """
+    return (
+        Post.objects
+        .using(DEFAULT_DB_ALIAS)
+        .filter(visibility=PostVisibility.SCHEDULED, **filters)
+        .order_by('pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+
+
+def get_seconds_until(moment):
+    return max(1, math.ceil(moment.timestamp() - timezone.now().timestamp()))
+
+
+def get_feed_schedule(**filters):
+    """Return the feed's visibility version and its next publication time.
+
+    The version, like a generation, is a time in nanoseconds: when the set
+    of visible posts was last seen to change without a write. The pair is
+    cached until the next scheduled post is due, and once it is, for short
+    periods until the scheduler has opened it.
+    """
+    scope = feed_scope(**filters)
+    generations = '.'.join(map(str, get_feed_generations(scope)))
+    digest = hashlib.md5(scope.encode()).hexdigest()
+    key = f'feed_schedule:{generations}:{digest}'
+    schedule = cache.get(key)
+    if schedule is None:
+        visible_at = get_next_publication(**filters)
+        schedule = (time.time_ns(), visible_at)
+        if visible_at is not None:
+            warn_if_overdue(visible_at)
+        cache.add(
+            key, schedule, visible_at and get_schedule_timeout(visible_at)
+        )
+        schedule = cache.get(key, schedule)
+    return schedule
+
+
+def get_schedule_timeout(visible_at):
+    """Seconds to cache a feed whose next scheduled post goes live then.
+
+    A post that is due but not yet opened keeps caches short: the feed
+    generations changed by publish_scheduled_posts may live in another
+    process's cache, so the database is asked again every
+    SCHEDULED_POST_RECHECK_INTERVAL seconds.
+    """
+    if visible_at > timezone.now():
+        return get_seconds_until(visible_at)
+    return settings.SCHEDULED_POST_RECHECK_INTERVAL
+
+
+def warn_if_overdue(visible_at):
+    overdue = (timezone.now() - visible_at).total_seconds()
+    if overdue > settings.SCHEDULED_POST_OVERDUE_WARNING:
+        logger.warning(
+            'A scheduled post is %d seconds overdue; is '
+            'publish_scheduled_posts running?', overdue,
+        )
+
+
+def get_feed_visibility_version(**filters):
+    return get_feed_schedule(**filters)[0]
+
+
+def get_feed_page_timeout(**filters):
+    """Expire no later than the next scheduled post in the feed goes live."""
+    return get_feed_timeout(settings.FEED_PAGE_CACHE_TIMEOUT, **filters)
+
+
+def get_post_count_timeout(**filters):
+    return get_feed_timeout(settings.POST_COUNT_CACHE_TIMEOUT, **filters)
+
+
+def get_feed_timeout(timeout, **filters):
+    _, visible_at = get_feed_schedule(**filters)
+    if visible_at is None:
+        return timeout
+    return min(timeout, get_schedule_timeout(visible_at))
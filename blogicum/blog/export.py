@@ -0,0 +1,78 @@
+import csv
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post
+from .utils import batched
+
+EXPORTS = {
+    'posts': (
+        Post,
+        (
+            'id', 'title', 'text', 'pub_date', 'created_at', 'is_published',
+            'author__username', 'category__slug', 'location__name', 'image',
+            'comment_count',
+        ),
+        {'author': 'author__username', 'category': 'category__slug'},
+    ),
+    'comments': (
+        Comment,
+        ('id', 'post_id', 'author__username', 'text', 'pub_date'),
+        {'author': 'author__username', 'category': 'post__category__slug'},
+    ),
+}
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def get_export_rows(kind, author=None, category=None):
+    model, fields, filter_fields = EXPORTS[kind]
+    filters = {
+        filter_fields[name]: value
+        for name, value in (('author', author), ('category', category))
+        if value
+    }
+    rows = (
+        model.objects
+        .filter(**filters)
+        .order_by('pk')
+        .values_list(*fields)
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    return fields, rows
+
+
+def iter_ndjson(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def iter_csv(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def export_content(kind, export_format, author=None, category=None):
+    """Yield the export as text chunks of EXPORT_CHUNK_SIZE rows each.
+
+    Rows are read with a server-side cursor where the database supports it,
+    so memory use does not depend on the size of the table.
+    """
+    fields, rows = get_export_rows(kind, author, category)
+    lines = (iter_ndjson if export_format == 'ndjson' else iter_csv)(
+        fields, rows
+    )
+    for batch in batched(lines, settings.EXPORT_CHUNK_SIZE):
+        yield ''.join(batch)
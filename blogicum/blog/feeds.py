@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .lookups import get_category_by_slug
+from .utils import get_base_posts_query
+
+User = get_user_model()
+
+
+class LatestPostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return get_base_posts_query().published()
+
+    def items(self, obj):
+        return self.get_posts(obj)[:settings.SYNDICATION_FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', kwargs={'pk': item.pk})
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+
+    def get_object(self, request, category_slug):
+        category = get_category_by_slug(category_slug)
+        if category is None or not category.is_published:
+            raise Http404
+        return category
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse(
+            'blog:category_posts', kwargs={'category_slug': obj.slug}
+        )
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category_id=obj.pk)
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(
+            User.objects.only('username'), username=username
+        )
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', kwargs={'username': obj.username})
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author_id=obj.pk)
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
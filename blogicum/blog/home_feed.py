@@ -0,0 +1,104 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache import get_feed_timeout
+from .lookups import get_lookup_tables
+from .models import Post
+
+HOME_FEED_VERSION_KEY = 'home_feed_version'
+
+
+def get_home_feed_key():
+    # Categories changing visibility reload the lookup tables, which starts
+    # a new feed, and so does any post moving into or out of it.
+    version = cache.get(HOME_FEED_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(HOME_FEED_VERSION_KEY, version, timeout=None):
+            version = cache.get(HOME_FEED_VERSION_KEY)
+    return f'home_feed:{get_lookup_tables().version}:{version}'
+
+
+def bump_home_feed_version():
+    cache.set(HOME_FEED_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def build_home_feed():
+    size = settings.HOME_FEED_SIZE
+    entries = list(
+        Post.objects
+        .published()
+        .order_by('-pub_date', '-pk')
+        .values_list('pub_date', 'pk')[:size + 1]
+    )
+    timeout = get_feed_timeout(settings.HOME_FEED_TIMEOUT)
+    return entries[:size], len(entries) <= size, time.time() + timeout
+
+
+def get_home_feed():
+    """Return the newest visible posts as ``(pub_date, id)`` pairs.
+
+    Returns ``(entries, complete, expires_at)``: ``complete`` tells whether
+    the entries are all the visible posts or only the newest of them. The
+    feed is kept in the cache until the next scheduled post goes live, or
+    until a post change starts a new one.
+    """
+    key = get_home_feed_key()
+    feed = cache.get(key)
+    if feed is None:
+        feed = build_home_feed()
+        cache.add(key, feed, max(1, int(feed[2] - time.time())))
+    return feed
+
+
+def invalidate_home_feed(previous, current):
+    """Start a new feed after a post moved into, out of or within it.
+
+    ``previous`` and ``current`` are the post's states before and after the
+    change, as used for the cached post counts. The feed is built again by
+    the next reader rather than edited in place, where concurrent saves
+    could undo each other. The version is bumped again on commit, so a feed
+    built from a snapshot taken before the change committed is never read.
+    """
+    if not any(
+        state is not None and (state.is_visible or state.is_scheduled)
+        for state in (previous, current)
+    ):
+        return
+    bump_home_feed_version()
+    transaction.on_commit(bump_home_feed_version)
+
+
+class HomeFeedPosts:
+    """Posts of the index page for the paginator, read by primary key.
+
+    Slices within the cached feed fetch the posts by id. Others, and any
+    slice whose posts turn out to be hidden or missing, are read from the
+    queryset.
+    """
+
+    ordered = True
+
+    def __init__(self, queryset):
+        # Same order as the feed, so pages past it continue where it ends.
+        self.queryset = queryset.order_by('-pub_date', '-pk')
+
+    def count(self):
+        return self.queryset.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self.queryset[key]
+        entries, complete, _ = get_home_feed()
+        if key.stop is None or (key.stop > len(entries) and not complete):
+            return list(self.queryset[key])
+        ids = [post_id for _, post_id in entries[key]]
+        posts = self.queryset.order_by().in_bulk(ids)
+        if len(posts) < len(ids):
+            cache.delete(get_home_feed_key())
+            return list(self.queryset[key])
+        return [posts[post_id] for post_id in ids]
@@ -0,0 +1,79 @@
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+WEBP_AVAILABLE = features.check('webp')
+
+FORMATS = {
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+}
+
+
+def get_formats():
+    return [
+        image_format for image_format in FORMATS
+        if image_format != 'webp' or WEBP_AVAILABLE
+    ]
+
+
+def get_variant_name(name, variant, image_format):
+    root, _ = posixpath.splitext(name)
+    extension, _ = FORMATS[image_format]
+    return f'{root}.{variant}.{extension}'
+
+
+def get_variant_names(name):
+    return [
+        get_variant_name(name, variant, image_format)
+        for variant in settings.POST_IMAGE_VARIANTS
+        for image_format in get_formats()
+    ]
+
+
+def render_variant(image, width, image_format):
+    if image.width > width:
+        image = image.resize(
+            (width, round(image.height * width / image.width)),
+            Image.Resampling.LANCZOS,
+        )
+    if image_format == 'jpeg' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    _, options = FORMATS[image_format]
+    buffer = BytesIO()
+    image.save(buffer, format=image_format.upper(), **options)
+    return buffer.getvalue()
+
+
+def generate_variants(field_file):
+    storage = field_file.storage
+    with field_file.open('rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    for variant, width in settings.POST_IMAGE_VARIANTS.items():
+        for image_format in get_formats():
+            name = get_variant_name(field_file.name, variant, image_format)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(
+                name,
+                ContentFile(render_variant(image, width, image_format)),
+            )
+
+
+def delete_variants(name, storage):
+    for variant_name in get_variant_names(name):
+        storage.delete(variant_name)
+
+
+def get_srcset(field_file, image_format):
+    candidates = []
+    for variant, width in settings.POST_IMAGE_VARIANTS.items():
+        name = get_variant_name(field_file.name, variant, image_format)
+        candidates.append(f'{field_file.storage.url(name)} {width}w')
+    return ', '.join(candidates)
@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from .cache import bump_post_feeds, bump_post_page, get_post_feed_keys
+from .images import generate_variants
+from .models import ImageJob, Post
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_image_job(post):
+    job = {
+        'image_name': post.image.name,
+        'started_at': None,
+        'attempts': 0,
+        'error': '',
+    }
+    if ImageJob.objects.filter(post=post).update(**job):
+        return
+    try:
+        with transaction.atomic():
+            ImageJob.objects.create(post=post, **job)
+    except IntegrityError:
+        ImageJob.objects.filter(post=post).update(**job)
+
+
+def claim_image_job():
+    """Atomically take the oldest available job, or return None.
+
+    A job is claimed by a conditional UPDATE on its ``started_at`` value,
+    so concurrent workers never process the same job twice and no
+    database-specific row locking is required.
+    """
+    now = timezone.now()
+    available = (
+        ImageJob.objects
+        .filter(attempts__lt=settings.IMAGE_JOB_MAX_ATTEMPTS)
+        .filter(
+            Q(started_at__isnull=True)
+            | Q(started_at__lt=now - timedelta(
+                seconds=settings.IMAGE_JOB_TIMEOUT
+            ))
+        )
+    )
+    for job in available[:settings.IMAGE_JOB_CLAIM_WINDOW]:
+        claimed = (
+            ImageJob.objects
+            .filter(pk=job.pk, started_at=job.started_at)
+            .update(started_at=now, attempts=F('attempts') + 1)
+        )
+        if claimed:
+            job.started_at = now
+            return job
+    return None
+
+
+def process_image_job(job):
+    post = Post.objects.only('image').filter(pk=job.post_id).first()
+    if post is None or post.image.name != job.image_name:
+        ImageJob.objects.filter(pk=job.pk, started_at=job.started_at).delete()
+        return False
+    try:
+        generate_variants(post.image)
+    except Exception as error:
+        logger.exception('Could not resize image %s', job.image_name)
+        # Other OSErrors (storage errors, but also truncated files, which
+        # Pillow reports the same way) are retried up to the attempt limit.
+        # A file that is not an image, a decompression bomb and any other
+        # error fail the job at once.
+        retry = isinstance(error, OSError) and not isinstance(
+            error, UnidentifiedImageError
+        )
+        failed = {} if retry else {'attempts': settings.IMAGE_JOB_MAX_ATTEMPTS}
+        ImageJob.objects.filter(pk=job.pk, started_at=job.started_at).update(
+            started_at=None, error=repr(error), **failed
+        )
+        return False
+    updated = Post.objects.filter(pk=post.pk, image=job.image_name).update(
+        has_image_variants=True, updated_at=timezone.now()
+    )
+    if updated:
+        bump_post_page(post.pk)
+        bump_post_feeds(*get_post_feed_keys(post.pk))
+    ImageJob.objects.filter(
+        pk=job.pk, image_name=job.image_name, started_at=job.started_at
+    ).delete()
+    return True
+
+
+def run_image_jobs(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_image_job()
+        if job is None:
+            break
+        process_image_job(job)
+        processed += 1
+    return processed
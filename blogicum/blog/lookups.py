@@ -0,0 +1,94 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import Category, Location
+
+LOOKUP_VERSION_KEY = 'lookup_tables_version'
+
+_tables = None
+
+
+class LookupTables:
+    """In-process copy of the category and location tables.
+
+    Post queries attach categories and locations from here instead of
+    joining them; which posts are visible is still decided in SQL. The copy
+    is reloaded when the version in the cache changes, which happens
+    whenever a category or location is saved or deleted, and in any case
+    after LOOKUP_TABLES_TIMEOUT seconds, since a process-local cache does
+    not see changes made by other processes.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        # Read from the primary: a copy loaded from a lagging replica would
+        # be kept until the next change.
+        self.categories = {
+            category.pk: category
+            for category in Category.objects.using(DEFAULT_DB_ALIAS).only(
+                'title', 'description', 'slug', 'is_published'
+            )
+        }
+        self.categories_by_slug = {
+            category.slug: category for category in self.categories.values()
+        }
+        self.locations = {
+            location.pk: location
+            for location in Location.objects.using(DEFAULT_DB_ALIAS).only(
+                'name', 'is_published'
+            )
+        }
+
+    def attach(self, post):
+        # Deferred foreign keys are skipped rather than loaded one by one.
+        loaded = post.__dict__
+        category = self.categories.get(loaded.get('category_id'))
+        if category is not None:
+            post.category = category
+        location = self.locations.get(loaded.get('location_id'))
+        if location is not None:
+            post.location = location
+
+
+def get_lookup_tables():
+    global _tables
+    version = cache.get(LOOKUP_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(LOOKUP_VERSION_KEY, version, timeout=None):
+            version = cache.get(LOOKUP_VERSION_KEY)
+    tables = _tables
+    if (
+        tables is None
+        or tables.version != version
+        or time.monotonic() - tables.loaded_at
+        >= settings.LOOKUP_TABLES_TIMEOUT
+    ):
+        tables = _tables = LookupTables(version)
+    return tables
+
+
+def get_category_by_slug(slug):
+    """Return the category with the slug, or None.
+
+    A slug missing from the tables may belong to a category created by
+    another process since they were loaded; the tables are then reloaded.
+    """
+    global _tables
+    tables = get_lookup_tables()
+    category = tables.categories_by_slug.get(slug)
+    if category is None and (
+        Category.objects.using(DEFAULT_DB_ALIAS).filter(slug=slug).exists()
+    ):
+        tables = _tables = LookupTables(tables.version)
+        category = tables.categories_by_slug.get(slug)
+    return category
+
+
+def bump_lookup_version():
+    cache.set(LOOKUP_VERSION_KEY, uuid4().hex, timeout=None)
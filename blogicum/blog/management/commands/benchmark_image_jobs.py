@@ -0,0 +1,96 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.images import ImageFile
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import generate_variants
+from blog.jobs import run_image_jobs
+from blog.models import Category, Post
+
+User = get_user_model()
+
+
+def make_photo(width, height):
+    image = Image.effect_mandelbrot(
+        (width, height), (-2.0, -1.2, 1.0, 1.2), 100
+    ).convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время загрузки фотографий и пропускную способность '
+        'очереди их обработки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uploads', type=int, default=20)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--width', type=int, default=4000)
+        parser.add_argument('--height', type=int, default=3000)
+
+    def upload(self, index):
+        try:
+            started = time.perf_counter()
+            post = Post.objects.create(
+                title=f'Фото {index}',
+                text='Замер производительности загрузки фото.',
+                pub_date=timezone.now(),
+                author=self.author,
+                category=self.category,
+                image=ImageFile(BytesIO(self.photo), name='benchmark.jpg'),
+            )
+            return post.pk, time.perf_counter() - started
+        finally:
+            connection.close()
+
+    def drain(self, _):
+        try:
+            return run_image_jobs()
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        uploads, threads = options['uploads'], options['threads']
+        self.photo = make_photo(options['width'], options['height'])
+        self.author, _ = User.objects.get_or_create(username='image_benchmark')
+        self.category = Category.objects.filter(is_published=True).first()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(self.upload, range(uploads)))
+        post_ids = [post_id for post_id, _ in results]
+        latencies = sorted(duration * 1000 for _, duration in results)
+        self.stdout.write(
+            f'Загрузка {uploads} фото в {threads} потоков: медиана '
+            f'{statistics.median(latencies):.1f} мс, максимум '
+            f'{latencies[-1]:.1f} мс'
+        )
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            processed = sum(executor.map(self.drain, range(threads)))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Обработка очереди в {threads} потоков: {processed} заданий '
+            f'за {elapsed:.2f} с ({processed / elapsed:.1f} фото/с)'
+        )
+
+        post = Post.objects.get(pk=post_ids[0])
+        started = time.perf_counter()
+        generate_variants(post.image)
+        self.stdout.write(
+            'Обработка одного фото внутри запроса заняла бы '
+            f'{(time.perf_counter() - started) * 1000:.1f} мс'
+        )
+
+        for post in Post.objects.filter(pk__in=post_ids):
+            post.delete()
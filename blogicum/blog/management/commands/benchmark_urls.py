@@ -0,0 +1,183 @@
+import json
+import statistics
+import time
+
+import django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from blog import urls as blog_urls
+from blog.models import Comment, Post
+from pages import urls as pages_urls
+
+CLIENT_DEFAULTS = {
+    # Errors are recorded in the report as 500 responses.
+    'raise_request_exception': False,
+    'HTTP_HOST': 'localhost',
+    # Keeps the debug toolbar, shown to INTERNAL_IPS, out of the numbers.
+    'REMOTE_ADDR': '192.0.2.1',
+}
+
+
+def get_url_patterns():
+    for module in (blog_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield f'{module.app_name}:{pattern.name}', pattern
+
+
+def measure(client, path, repeat, cold):
+    durations, queries = [], []
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = client.get(path)
+            durations.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context.captured_queries))
+    durations.sort()
+    return {
+        'status': response.status_code,
+        'bytes': len(response.content),
+        'queries': max(queries),
+        'median_ms': round(statistics.median(durations), 2),
+        'p90_ms': round(durations[int(len(durations) * 0.9)], 2),
+        'max_ms': round(durations[-1], 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время ответа и число запросов к БД для каждого адреса '
+        'приложений blog и pages и сохраняет отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Файл для отчёта; по умолчанию отчёт выводится на экран.',
+        )
+        parser.add_argument(
+            '--compare',
+            default=None,
+            help='Отчёт предыдущего замера, с которым сравнить результаты.',
+        )
+        parser.add_argument(
+            '--seed-posts',
+            type=int,
+            default=0,
+            help='Перед замером создать столько публикаций (seed_blog).',
+        )
+        parser.add_argument('--seed-comments', type=int, default=0)
+        parser.add_argument('--seed-skew', type=float, default=3.0)
+
+    def get_samples(self):
+        post = (
+            Post.objects
+            .published()
+            .filter(category__isnull=False)
+            .select_related('author', 'category')
+            .order_by('-comment_count')
+            .first()
+        )
+        if post is None:
+            raise CommandError(
+                'В базе нет опубликованных публикаций; заполните её командой '
+                'seed_blog или параметром --seed-posts.'
+            )
+        comments = Comment.objects.filter(post=post).order_by('-pk')
+        comment = comments.filter(author=post.author).first()
+        return post, comment or comments.first()
+
+    def get_kwargs(self, pattern, post, comment):
+        params = pattern.pattern.converters
+        if 'post_id' in params:
+            if comment is None:
+                return None
+            return {'post_id': comment.post_id, 'pk': comment.pk}
+        samples = {
+            'pk': post.pk,
+            'username': post.author.username,
+            'category_slug': post.category.slug,
+            'kind': 'posts',
+        }
+        return {name: samples[name] for name in params}
+
+    def run(self, repeat):
+        post, comment = self.get_samples()
+        clients = {
+            'anonymous': Client(**CLIENT_DEFAULTS),
+            'author': Client(**CLIENT_DEFAULTS),
+        }
+        clients['author'].force_login(post.author)
+        results = {}
+        for name, pattern in get_url_patterns():
+            kwargs = self.get_kwargs(pattern, post, comment)
+            if kwargs is None:
+                self.stderr.write(f'{name}: нет подходящих данных, пропущен.')
+                continue
+            path = reverse(name, kwargs=kwargs)
+            results[name] = {'path': path}
+            for client_name, client in clients.items():
+                results[name][client_name] = {
+                    'cold': measure(client, path, repeat, cold=True),
+                    'warm': measure(client, path, repeat, cold=False),
+                }
+        return results
+
+    def compare(self, report, previous):
+        for name, result in report['urls'].items():
+            for client_name in ('anonymous', 'author'):
+                for mode in ('cold', 'warm'):
+                    try:
+                        before = previous['urls'][name][client_name][mode]
+                    except KeyError:
+                        continue
+                    after = result[client_name][mode]
+                    change = (
+                        after['median_ms'] / before['median_ms'] - 1
+                        if before['median_ms'] else 0
+                    )
+                    self.stdout.write(
+                        f'{name} {client_name} {mode}: '
+                        f'{before["median_ms"]} -> {after["median_ms"]} мс '
+                        f'({change:+.0%}), запросов '
+                        f'{before["queries"]} -> {after["queries"]}'
+                    )
+
+    def handle(self, *args, **options):
+        if options['seed_posts']:
+            call_command(
+                'seed_blog',
+                posts=options['seed_posts'],
+                comments=options['seed_comments'],
+                skew=options['seed_skew'],
+                stdout=self.stdout,
+            )
+        report = {
+            'environment': {
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'posts': Post.objects.count(),
+                'comments': Comment.objects.count(),
+                'repeat': options['repeat'],
+            },
+            'urls': self.run(options['repeat']),
+        }
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content + '\n')
+        else:
+            self.stdout.write(content)
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                self.compare(report, json.load(file))
@@ -0,0 +1,95 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog.models import Comment, Post
+from blog.utils import get_base_posts_query
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает планы выполнения и время запросов лент публикаций '
+        'с индексами и без них.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--without-indexes',
+            action='store_true',
+            help=(
+                'Дополнительно выполнить запросы, временно удалив индексы '
+                'лент (в откатываемой транзакции).'
+            ),
+        )
+
+    def get_access_paths(self):
+        post = (
+            Post.objects.order_by('-comment_count').only('pk').first()
+        )
+        sample = (
+            Post.objects
+            .filter(category__isnull=False)
+            .select_related('category', 'author')
+            .only('category__slug', 'author__username')
+            .first()
+        )
+        if post is None or sample is None:
+            raise CommandError(
+                'В базе нет публикаций; заполните её командой seed_blog.'
+            )
+        published = get_base_posts_query().published()
+        return {
+            'index': published[:settings.PAGE_SIZE],
+            'category_posts': published.filter(
+                category__slug=sample.category.slug
+            )[:settings.PAGE_SIZE],
+            'profile': get_base_posts_query().filter(
+                author__username=sample.author.username
+            )[:settings.PAGE_SIZE],
+            'post_comments': Comment.objects.filter(post=post)[:100],
+        }
+
+    def drop_indexes(self):
+        with connection.schema_editor(atomic=False) as editor:
+            for model in (Post, Comment):
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+
+    def measure(self, label, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        for name, queryset in self.get_access_paths().items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset._chain())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'{name}: медиана {statistics.median(timings):.2f} мс'
+            )
+            self.stdout.write(queryset.explain())
+            self.stdout.write('')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        if options['without_indexes']:
+            if not connection.features.can_rollback_ddl:
+                raise CommandError(
+                    'База данных не поддерживает откат DDL в транзакции.'
+                )
+            try:
+                with connection.constraint_checks_disabled():
+                    with transaction.atomic():
+                        self.drop_indexes()
+                        self.measure('Без индексов', repeat)
+                        raise Rollback
+            except Rollback:
+                pass
+        self.measure('С индексами', repeat)
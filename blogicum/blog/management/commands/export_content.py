@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.export import EXPORTS, FORMATS, export_content
+
+
+class Command(BaseCommand):
+    help = 'Выгружает публикации или комментарии в формате NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=EXPORTS)
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию вывод на экран.'
+        )
+
+    def handle(self, *args, **options):
+        chunks = export_content(
+            options['kind'],
+            options['format'],
+            author=options['author'],
+            category=options['category'],
+        )
+        if options['output']:
+            with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+            ) as file:
+                file.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
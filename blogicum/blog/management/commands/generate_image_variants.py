@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import generate_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии фотографий публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать копии и для уже обработанных фотографий.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('image')
+        if not options['all']:
+            posts = posts.filter(has_image_variants=False)
+        processed = 0
+        for post in posts.iterator():
+            try:
+                generate_variants(post.image)
+            except OSError as error:
+                self.stderr.write(f'{post.image.name}: {error}')
+                continue
+            Post.objects.filter(pk=post.pk).update(
+                has_image_variants=True, updated_at=timezone.now()
+            )
+            processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано фотографий: {processed}')
+        )
@@ -0,0 +1,189 @@
+import gzip
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer
+from django.db import connection, transaction
+
+from blog.cache import bump_feed_generation
+from blog.home_feed import bump_home_feed_version
+from blog.lookups import bump_lookup_version
+from blog.models import Comment, Post
+from blog.utils import (
+    batched, iter_json_array, rebuild_author_stats, rebuild_comment_counts,
+    refresh_post_visibility
+)
+
+
+def open_fixture(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def insert_rows(model, objs, ignore_conflicts=False):
+    """Insert rows in batches, keeping their field values as given.
+
+    Unlike bulk_create(), values of auto_now and auto_now_add fields are
+    taken from the fixture, as loaddata does.
+    """
+    meta = model._meta
+    with_pk = [obj for obj in objs if obj.pk is not None]
+    without_pk = [obj for obj in objs if obj.pk is None]
+    for rows, fields in (
+        (with_pk, meta.concrete_fields),
+        (without_pk, [f for f in meta.concrete_fields if f != meta.pk]),
+    ):
+        if not rows:
+            continue
+        batch_size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+        for batch in batched(rows, batch_size):
+            model._base_manager._insert(
+                batch, fields=fields, raw=True,
+                ignore_conflicts=ignore_conflicts,
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает фикстуру в JSON-формате сериализатора Django '
+        '(как db.json) пачками многострочных INSERT.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать записи, которые уже есть в базе.',
+        )
+        parser.add_argument(
+            '--keep-indexes',
+            action='store_true',
+            help=(
+                'Не удалять индексы моделей на время загрузки '
+                '(по умолчанию они создаются заново в конце).'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.keep_indexes = options['keep_indexes']
+        self.pending = defaultdict(list)
+        self.counts = Counter()
+        self.dropped_indexes = []
+        started = time.perf_counter()
+
+        # Foreign keys are checked once, after all rows are in place, so the
+        # fixture may list rows in any order.
+        with connection.constraint_checks_disabled():
+            with transaction.atomic():
+                for path in options['fixtures']:
+                    self.load(path)
+                for model in list(self.pending):
+                    self.flush(model)
+                self.restore_indexes()
+                connection.check_constraints(table_names=[
+                    model._meta.db_table for model in self.counts
+                ])
+                self.reset_sequences()
+        self.update_denormalized_data()
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        for model, count in self.counts.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {total} за {elapsed:.1f} с '
+            f'({total / elapsed:.0f} записей/с)'
+        ))
+
+    def load(self, path):
+        try:
+            with open_fixture(path) as file:
+                for obj in Deserializer(iter_json_array(file)):
+                    self.add(obj)
+        except (OSError, ValueError, DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить {path}: {error}')
+
+    def add(self, obj):
+        model = type(obj.object)
+        if model not in self.counts and model not in self.pending:
+            self.drop_indexes(model)
+        batch = self.pending[model]
+        batch.append(obj)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        insert_rows(
+            model,
+            [obj.object for obj in batch],
+            ignore_conflicts=self.ignore_conflicts,
+        )
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            insert_rows(
+                through,
+                [
+                    through(**{
+                        f'{field.m2m_field_name()}_id': obj.object.pk,
+                        f'{field.m2m_reverse_field_name()}_id': related_pk,
+                    })
+                    for obj in batch
+                    for related_pk in obj.m2m_data.get(field.name, ())
+                ],
+                ignore_conflicts=self.ignore_conflicts,
+            )
+        self.counts[model] += len(batch)
+        if self.verbosity > 1:
+            self.stdout.write(
+                f'{model._meta.label}: {self.counts[model]}', ending='\r'
+            )
+
+    def drop_indexes(self, model):
+        if self.keep_indexes:
+            return
+        # The statements are run directly: leaving a schema editor context
+        # would check all foreign keys while the rows are still being loaded.
+        editor = connection.schema_editor()
+        for index in model._meta.indexes:
+            editor.execute(index.remove_sql(model, editor))
+            self.dropped_indexes.append((model, index))
+
+    def restore_indexes(self):
+        editor = connection.schema_editor()
+        for model, index in self.dropped_indexes:
+            editor.execute(index.create_sql(model, editor))
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.counts)
+        )
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def update_denormalized_data(self):
+        # Rows are inserted without model signals, so the data they maintain
+        # is brought up to date here.
+        if Post in self.counts:
+            refresh_post_visibility()
+        if Post in self.counts or Comment in self.counts:
+            rebuild_comment_counts()
+            rebuild_author_stats()
+            self.stdout.write(
+                'Счётчики комментариев и статистика авторов пересчитаны. '
+                'Обновите поисковый индекс и копии изображений командами '
+                'rebuild_search_index и generate_image_variants.'
+            )
+        bump_feed_generation()
+        bump_home_feed_version()
+        bump_lookup_version()
@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.jobs import run_image_jobs
+
+
+def drain_queue():
+    try:
+        return run_image_jobs()
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь уменьшения фотографий публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать текущую очередь и завершить работу.',
+        )
+        parser.add_argument('--threads', type=int, default=1)
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            while True:
+                processed = sum(
+                    executor.map(
+                        lambda _: drain_queue(), range(options['threads'])
+                    )
+                )
+                if processed:
+                    self.stdout.write(f'Обработано заданий: {processed}')
+                if options['once']:
+                    break
+                if not processed:
+                    time.sleep(options['poll_interval'])
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import PublicationScheduler, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Открывает отложенные публикации читателям в момент наступления '
+        'их даты публикации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Открыть публикации, время которых уже наступило, и выйти.',
+        )
+        parser.add_argument(
+            '--refresh-interval',
+            type=float,
+            default=60.0,
+            help=(
+                'Как часто в секундах перечитывать расписание, чтобы '
+                'учесть публикации, отложенные после запуска.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            published = publish_due_posts()
+            self.stdout.write(f'Открыто публикаций: {published}')
+            return
+        scheduler = PublicationScheduler(options['refresh_interval'])
+        while True:
+            published = scheduler.run_pending()
+            if published:
+                self.stdout.write(f'Открыто публикаций: {published}')
+            time.sleep(scheduler.seconds_until_next())
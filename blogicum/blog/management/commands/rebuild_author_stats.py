@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает статистику авторов: число публикаций, комментариев '
+        'и время последней активности.'
+    )
+
+    def handle(self, *args, **options):
+        created = rebuild_author_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено пользователей: {created}')
+        )
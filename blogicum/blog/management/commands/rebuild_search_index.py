@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.search import get_backend
+from blog.utils import batched
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2_000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.clear()
+        batch_size = options['batch_size']
+        indexed = 0
+        posts = (
+            Post.objects.only('title', 'text')
+            .order_by('pk')
+            .iterator(chunk_size=batch_size)
+        )
+        for batch in batched(posts, batch_size):
+            with transaction.atomic():
+                backend.index(batch)
+            indexed += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {indexed}')
+        )
@@ -0,0 +1,138 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.cache import bump_feed_generation
+from blog.home_feed import bump_home_feed_version
+from blog.lookups import bump_lookup_version
+from blog.models import Category, Comment, Location, Post
+from blog.search import index_posts
+from blog.utils import (
+    batched, rebuild_author_stats, rebuild_comment_counts,
+    refresh_post_visibility
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими публикациями и комментариями '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=0)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=10)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=3.0,
+            help='Чем больше, тем сильнее комментарии смещены к новым постам.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        now = timezone.now()
+        prefix = now.strftime('%Y%m%d%H%M%S')
+
+        with transaction.atomic():
+            User.objects.bulk_create(
+                User(username=f'seed_{prefix}_{i}', password='!')
+                for i in range(options['users'])
+            )
+            Category.objects.bulk_create(
+                Category(
+                    title=f'Категория {i}',
+                    description='Сгенерированная категория',
+                    slug=f'seed-{prefix}-{i}',
+                    is_published=rnd.random() > 0.1,
+                )
+                for i in range(options['categories'])
+            )
+            Location.objects.bulk_create(
+                Location(name=f'{prefix} {i}', is_published=rnd.random() > 0.1)
+                for i in range(options['locations'])
+            )
+        # SQLite does not return primary keys from bulk_create, so the
+        # freshly created rows are read back by their generated names.
+        users = list(
+            User.objects.filter(username__startswith=f'seed_{prefix}_')
+        )
+        categories = list(
+            Category.objects.filter(slug__startswith=f'seed-{prefix}-')
+        )
+        locations = list(Location.objects.filter(name__startswith=prefix))
+        if not users or not categories:
+            self.stderr.write('Нужен хотя бы один пользователь и категория.')
+            return
+
+        posts = (
+            Post(
+                title=f'Публикация {i}',
+                text='Сгенерированный текст публикации. ' * 5,
+                pub_date=now - timedelta(minutes=rnd.randint(-10_000, 10**7)),
+                author=rnd.choice(users),
+                category=rnd.choice(categories),
+                location=rnd.choice(locations) if locations else None,
+                is_published=rnd.random() > 0.05,
+            )
+            for i in range(options['posts'])
+        )
+        last_post_id = Post.objects.aggregate(Max('pk'))['pk__max'] or 0
+        for batch in batched(posts, batch_size):
+            Post.objects.bulk_create(batch)
+        refresh_post_visibility()
+        # bulk_create skips the signal that indexes posts for search.
+        new_posts = (
+            Post.objects
+            .filter(pk__gt=last_post_id)
+            .only('title', 'text')
+            .order_by('pk')
+            .iterator(chunk_size=batch_size)
+        )
+        for batch in batched(new_posts, batch_size):
+            with transaction.atomic():
+                index_posts(batch)
+        self.stdout.write(f'Создано публикаций: {options["posts"]}')
+
+        if options['comments']:
+            post_ids = list(
+                Post.objects
+                .filter(pk__gt=last_post_id)
+                .order_by('-pub_date')
+                .values_list('pk', flat=True)
+            )
+            skew = options['skew']
+            comments = (
+                Comment(
+                    text=f'Комментарий {i}',
+                    author=rnd.choice(users),
+                    post_id=post_ids[
+                        int(len(post_ids) * rnd.random() ** skew)
+                    ],
+                )
+                for i in range(options['comments'])
+            )
+            for batch in batched(comments, batch_size):
+                Comment.objects.bulk_create(batch)
+            rebuild_comment_counts()
+            self.stdout.write(f'Создано комментариев: {options["comments"]}')
+
+        rebuild_author_stats()
+        # Rows written by bulk_create sent no signals: drop what was cached.
+        bump_lookup_version()
+        bump_feed_generation()
+        bump_home_feed_version()
+        self.stdout.write(self.style.SUCCESS('Готово.'))
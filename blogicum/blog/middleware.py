@@ -0,0 +1,192 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connections
+
+from .routers import (
+    end_request_routing, set_request_replica, start_request_routing
+)
+
+logger = logging.getLogger('blog.metrics')
+
+METRICS = ('total_ms', 'sql_ms', 'queries', 'template_ms')
+
+
+class RequestStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(self._new_window)
+
+    @staticmethod
+    def _new_window():
+        return deque(maxlen=settings.REQUEST_METRICS_WINDOW)
+
+    def add(self, view_name, sample):
+        with self._lock:
+            self._samples[view_name].append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        with self._lock:
+            samples = {
+                view: list(window) for view, window in self._samples.items()
+            }
+        return {
+            view: {
+                'count': len(window),
+                **{
+                    metric: percentiles([sample[metric] for sample in window])
+                    for metric in METRICS
+                },
+            }
+            for view, window in sorted(samples.items())
+        }
+
+
+def percentiles(values):
+    values = sorted(values)
+    last = len(values) - 1
+    return {
+        f'p{rank}': round(values[min(last, len(values) * rank // 100)], 2)
+        for rank in (50, 90, 99)
+    }
+
+
+request_stats = RequestStats()
+
+
+class QueryTimer:
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """Samples query count, SQL, template and total time per request.
+
+    Sampled requests get a ``Server-Timing`` header, a JSON log line on the
+    ``blog.metrics`` logger and are added to the per-view percentiles shown
+    by the staff-only ``blog:request_stats`` page. Unsampled requests only
+    pay for one ``random()`` call.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if sample_rate <= 0 or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        request._template_timing = [0.0, 0.0]
+        started = time.perf_counter()
+        wrappers = [
+            connection.execute_wrapper(timer)
+            for connection in connections.all()
+        ]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+        total = time.perf_counter() - started
+
+        template_started, template_finished = request._template_timing
+        match = request.resolver_match
+        sample = {
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': total * 1000,
+            'sql_ms': timer.duration * 1000,
+            'queries': timer.queries,
+            'template_ms': max(template_finished - template_started, 0) * 1000,
+        }
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={sample["sql_ms"]:.1f};desc="{timer.queries} queries"',
+            f'tpl;dur={sample["template_ms"]:.1f}',
+            f'total;dur={sample["total_ms"]:.1f}',
+        ))
+        logger.info(json.dumps(sample))
+        if sample['view']:
+            request_stats.add(sample['view'], sample)
+        return response
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, '_template_timing', None)
+        if timing is not None:
+            timing[0] = time.perf_counter()
+
+            def finish(response):
+                timing[1] = time.perf_counter()
+
+            response.add_post_render_callback(finish)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Route reads of views marked ``read_from_replica`` to a replica.
+
+    Only GET and HEAD requests are routed, and only when DATABASE_REPLICAS
+    is set. A request that writes anything sets a cookie that keeps the
+    client's reads on the primary for DATABASE_REPLICA_LAG seconds, so
+    authors see their new posts and comments at once.
+    """
+
+    cookie_name = 'read_primary_until'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing, token = start_request_routing()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request_routing(token)
+        if routing.wrote:
+            lag = settings.DATABASE_REPLICA_LAG
+            response.set_cookie(
+                self.cookie_name,
+                str(int(time.time() + lag)),
+                max_age=lag,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def is_sticky(self, request):
+        try:
+            return int(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in ('GET', 'HEAD')
+            and getattr(view_class, 'read_from_replica', False)
+            and not self.is_sticky(request)
+        ):
+            set_request_replica(random.choice(settings.DATABASE_REPLICAS))
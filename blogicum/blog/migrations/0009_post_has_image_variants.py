@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='has_image_variants',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Уменьшенные копии фото готовы'),
+        ),
+    ]
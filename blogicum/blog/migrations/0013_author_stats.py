@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def fill_author_stats(apps, schema_editor):
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    def aggregate_by_author(model, aggregate):
+        return Subquery(
+            model.objects
+            .filter(author=OuterRef('pk'))
+            .order_by()
+            .values('author')
+            .annotate(value=aggregate)
+            .values('value')
+        )
+
+    rows = User.objects.annotate(
+        post_count=Coalesce(aggregate_by_author(Post, Count('pk')), 0),
+        comment_count=Coalesce(aggregate_by_author(Comment, Count('pk')), 0),
+        last_post_at=aggregate_by_author(Post, Max('updated_at')),
+        last_comment_at=aggregate_by_author(Comment, Max('pub_date')),
+    ).values_list(
+        'pk', 'post_count', 'comment_count', 'last_post_at', 'last_comment_at'
+    )
+    AuthorStats.objects.bulk_create(
+        (
+            AuthorStats(
+                user_id=user_id,
+                post_count=post_count,
+                comment_count=comment_count,
+                last_activity_at=max(filter(None, activity), default=None),
+            )
+            for user_id, post_count, comment_count, *activity in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0012_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:25
+
+from django.db import migrations, models
+from django.utils import timezone
+
+HIDDEN, SCHEDULED, VISIBLE = range(3)
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    now = timezone.now()
+    Post.objects.filter(is_published=True, pub_date__gt=now).update(
+        visibility=SCHEDULED
+    )
+    Post.objects.filter(is_published=True, pub_date__lte=now).update(
+        visibility=VISIBLE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_author_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_category_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='visibility',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Скрыта'), (1, 'Ждёт даты публикации'), (2, 'Видна читателям')], default=0, editable=False, verbose_name='Видимость'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 2)), fields=['-pub_date', '-id'], name='post_published_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 2)), fields=['category', '-pub_date', '-id'], name='post_category_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 1)), fields=['pub_date'], name='post_scheduled_idx'),
+        ),
+    ]
@@ -1,8 +1,27 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 
+from .cache import (
+    feed_scope, get_feed_generations, get_feed_page_key,
+    get_feed_page_timeout, get_feed_visibility_version,
+    get_post_card_version, get_post_count_key, get_post_count_timeout
+)
 from .forms import PostCreateForm
 from .models import Comment, Post
+from .pagination import (
+    CachedCountPaginator, CursorPaginator, InvalidCursor
+)
+from .routers import read_from_primary
 
 
 class PostMixin:
@@ -17,11 +36,25 @@ class PostMixin:
         )
 
 
-class PostDispatchMixin:
+class StaffRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+
+class SingleObjectFetchMixin:
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_fetched_object'):
+            self._fetched_object = super().get_object(queryset)
+        return self._fetched_object
+
+
+class PostDispatchMixin(SingleObjectFetchMixin):
 
     def dispatch(self, request, *args, **kwargs):
         post = self.get_object()
-        if self.request.user != post.author:
+        if request.user.id != post.author_id:
             return redirect('blog:post_detail', post.pk)
         return super().dispatch(request, *args, **kwargs)
 
@@ -31,12 +64,12 @@ class CommentMixin:
     fields = ('text',)
 
 
-class CommentDispatchSuccessMixin:
+class CommentDispatchSuccessMixin(SingleObjectFetchMixin):
     template_name = 'blog/comment.html'
 
     def dispatch(self, request, *args, **kwargs):
         comment = self.get_object()
-        if request.user != comment.author:
+        if request.user.id != comment.author_id:
             return redirect('blog:post_detail', kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
@@ -44,3 +77,167 @@ class CommentDispatchSuccessMixin:
         return reverse_lazy(
             'blog:post_detail', kwargs={'pk': self.kwargs['post_id']}
         )
+
+
+class CursorPaginationMixin:
+    cursor_pagination = settings.CURSOR_PAGINATION
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = self.cursor_pagination
+        return context
+
+
+class CachedCountPaginationMixin:
+    """Cache the post count of the list and show a window of page links."""
+
+    paginator_class = CachedCountPaginator
+    page_links_on_each_side = 2
+    page_links_on_ends = 1
+
+    def get_feed_filter(self):
+        return {}
+
+    def get_count_audience(self):
+        return 'public'
+
+    def get_count_key(self):
+        return get_post_count_key(
+            feed_scope(**self.get_feed_filter()), self.get_count_audience()
+        )
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        count_key = self.get_count_key()
+        return super().get_paginator(
+            queryset,
+            per_page,
+            count_key=count_key,
+            count_timeout=count_key and get_post_count_timeout(
+                **self.get_feed_filter()
+            ),
+            **kwargs,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = context.get('paginator')
+        if isinstance(paginator, Paginator):
+            context['page_range'] = list(paginator.get_elided_page_range(
+                context['page_obj'].number,
+                on_each_side=self.page_links_on_each_side,
+                on_ends=self.page_links_on_ends,
+            ))
+        return context
+
+
+class CommentPageMixin:
+    comments_cursor_parameter = 'comments_after'
+
+    def get_comments_page(self, post_id):
+        paginator = CursorPaginator(
+            Comment.objects.filter(post_id=post_id).select_related('author'),
+            settings.COMMENTS_PAGE_SIZE,
+            newest_first=False,
+        )
+        try:
+            return paginator.page(
+                after=self.request.GET.get(self.comments_cursor_parameter)
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы.')
+
+
+class FeedPageCacheMixin:
+
+    def get_feed_filter(self):
+        return {}
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        feed_filter = self.get_feed_filter()
+        key = get_feed_page_key(
+            feed_scope(**feed_filter), request.get_full_path()
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        def cache_response(response):
+            cache.set(key, response, get_feed_page_timeout(**feed_filter))
+
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(cache_response)
+        else:
+            cache_response(response)
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer conditional GET requests with 304 before rendering the page.
+
+    The ETag comes from cached versions, which are times in nanoseconds of
+    the last change to the page's content, so checking it does not touch
+    the database. No Last-Modified is sent: its whole seconds would hide a
+    change made in the same second, and it cannot vary by user.
+    """
+
+    def get_condition_versions(self):
+        feed_filter = self.get_feed_filter()
+        return (
+            *get_feed_generations(feed_scope(**feed_filter)),
+            get_feed_visibility_version(**feed_filter),
+        )
+
+    def get_etag(self, versions):
+        request = self.request
+        parts = (
+            request.get_full_path(),
+            str(request.user.pk),
+            # Pages for signed-in users embed the CSRF token.
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+            *map(str, versions),
+        )
+        return quote_etag(hashlib.md5('|'.join(parts).encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        versions = self.get_condition_versions()
+        age = time.time_ns() - max(versions)
+        if age < settings.DATABASE_REPLICA_LAG * 10**9:
+            # A replica may not have the change yet, and the page and its
+            # ETag would be cached as if it had.
+            read_from_primary()
+        etag = self.get_etag(versions)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+
+class PostCardMixin:
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post_card_version'] = get_post_card_version()
+        context['post_card_timeout'] = settings.POST_CARD_CACHE_TIMEOUT
+        return context
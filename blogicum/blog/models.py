@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -49,6 +50,60 @@ class Location(PublishedModel):
         return self.name[:settings.MAX_CHAR_COUNT]
 
 
+class PostVisibility(models.IntegerChoices):
+    HIDDEN = 0, 'Скрыта'
+    SCHEDULED = 1, 'Ждёт даты публикации'
+    VISIBLE = 2, 'Видна читателям'
+
+    @classmethod
+    def of(cls, is_published, pub_date):
+        if not is_published:
+            return cls.HIDDEN
+        if pub_date > timezone.now():
+            return cls.SCHEDULED
+        return cls.VISIBLE
+
+
+class LookupModelIterable(models.query.ModelIterable):
+
+    def __iter__(self):
+        from .lookups import get_lookup_tables
+
+        tables = get_lookup_tables()
+        for post in super().__iter__():
+            tables.attach(post)
+            yield post
+
+
+class PostQuerySet(models.QuerySet):
+
+    def with_lookups(self):
+        """Take categories and locations from the in-process lookup tables."""
+        clone = self._chain()
+        clone._iterable_class = LookupModelIterable
+        return clone
+
+    def get_published_filter(self):
+        # Category visibility is checked by a join rather than against the
+        # in-process lookup tables, which other processes cannot refresh.
+        # The planner still walks the feed indexes and looks each category
+        # up by primary key.
+        return models.Q(
+            visibility=PostVisibility.VISIBLE,
+            category__is_published=True,
+        )
+
+    def published(self):
+        return self.filter(self.get_published_filter())
+
+    def visible_to(self, user):
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(
+            self.get_published_filter() | models.Q(author=user)
+        )
+
+
 class Post(PublishedModel):
     title = models.CharField('Заголовок', max_length=256)
     text = models.TextField('Текст')
@@ -81,12 +136,53 @@ class Post(PublishedModel):
         verbose_name='Категория',
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    visibility = models.PositiveSmallIntegerField(
+        'Видимость',
+        choices=PostVisibility.choices,
+        default=PostVisibility.HIDDEN,
+        editable=False,
+    )
+    has_image_variants = models.BooleanField(
+        'Уменьшенные копии фото готовы',
+        default=False,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        default=timezone.now,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
-    def comment_count(self):
-        return self.comments.count()
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(visibility=PostVisibility.VISIBLE),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(visibility=PostVisibility.VISIBLE),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(visibility=PostVisibility.SCHEDULED),
+                name='post_scheduled_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
@@ -114,8 +210,80 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(
+                fields=('post', 'pub_date', 'id'),
+                name='comment_post_pub_date_idx',
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text[:settings.MAX_CHAR_COUNT]
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь',
+    )
+    post_count = models.PositiveIntegerField('Публикаций', default=0)
+    comment_count = models.PositiveIntegerField('Комментариев', default=0)
+    last_activity_at = models.DateTimeField(
+        'Последняя активность', null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return str(self.user)
+
+
+class ImageJob(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_job',
+        verbose_name='Публикация',
+    )
+    image_name = models.CharField('Файл', max_length=100)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    started_at = models.DateTimeField('Взято в работу', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    error = models.TextField('Ошибка', blank=True)
+
+    class Meta:
+        ordering = ('created_at',)
+        verbose_name = 'обработка фото'
+        verbose_name_plural = 'Очередь обработки фото'
+
+    def __str__(self):
+        return self.image_name
+
+
+class SearchTerm(models.Model):
+    term = models.CharField('Основа слова', max_length=64)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        verbose_name='Публикация',
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'), name='unique_search_term_post'
+            ),
+        )
+        verbose_name = 'поисковый термин'
+        verbose_name_plural = 'Поисковый индекс'
+
+    def __str__(self):
+        return self.term
@@ -0,0 +1,136 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(post):
+    return urlsafe_base64_encode(
+        force_bytes(f'{post.pub_date.isoformat()}|{post.pk}')
+    )
+
+
+def decode_cursor(token):
+    try:
+        pub_date, pk = force_str(urlsafe_base64_decode(token)).split('|')
+        pub_date, pk = parse_datetime(pub_date), int(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(token)
+    if pub_date is None:
+        raise InvalidCursor(token)
+    return pub_date, pk
+
+
+class CursorPage:
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+class CursorPaginator:
+    """Keyset paginator over ``(pub_date, id)``, newest first by default.
+
+    Pages are addressed by opaque ``after``/``before`` tokens instead of
+    page numbers, so neither ``OFFSET`` nor ``COUNT(*)`` is ever issued.
+    """
+
+    def __init__(self, object_list, per_page, newest_first=True):
+        self.newest_first = newest_first
+        ordering = ('-pub_date', '-pk') if newest_first else ('pub_date', 'pk')
+        self.object_list = object_list.order_by(*ordering)
+        self.per_page = int(per_page)
+
+    def beyond(self, cursor, forward=True):
+        pub_date, pk = decode_cursor(cursor)
+        lookup = 'lt' if forward == self.newest_first else 'gt'
+        return (
+            Q(**{f'pub_date__{lookup}': pub_date})
+            | Q(pub_date=pub_date, **{f'pk__{lookup}': pk})
+        )
+
+    def page(self, after=None, before=None):
+        if before:
+            items = list(
+                self.object_list
+                .filter(self.beyond(before, forward=False))
+                .reverse()[:self.per_page + 1]
+            )
+            return CursorPage(
+                items[:self.per_page][::-1],
+                has_next=True,
+                has_previous=len(items) > self.per_page,
+            )
+        queryset = self.object_list
+        if after:
+            queryset = queryset.filter(self.beyond(after))
+        items = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            items[:self.per_page],
+            has_next=len(items) > self.per_page,
+            has_previous=bool(after),
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """Page-number paginator that keeps the object count in the cache.
+
+    All pages of a list share one count, stored under ``count_key`` for
+    ``count_timeout`` seconds and adjusted in place as posts are published
+    and unpublished, so ``COUNT(*)`` is only run when the entry is missing.
+    Without a key it behaves like ``Paginator``.
+    """
+
+    def __init__(self, *args, count_key=None, count_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+        self.count_timeout = count_timeout
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        count = cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            # add() keeps an adjustment made while the count was running.
+            cache.add(self.count_key, count, self.count_timeout)
+        return max(count, 0)
@@ -0,0 +1,63 @@
+from contextvars import ContextVar
+
+_routing = ContextVar('db_routing', default=None)
+
+# Sessions and accounts are always read from the primary: a session saved
+# on login must be found by the very next request.
+PRIMARY_APPS = {'auth', 'sessions'}
+
+
+class RequestRouting:
+    """Database routing of the current request.
+
+    ``replica`` is the alias reads go to, or None for the primary.
+    ``wrote`` is set once anything is written, so the client can be kept on
+    the primary while the replicas catch up.
+    """
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def start_request_routing():
+    routing = RequestRouting()
+    return routing, _routing.set(routing)
+
+
+def end_request_routing(token):
+    _routing.reset(token)
+
+
+def set_request_replica(alias):
+    routing = _routing.get()
+    if routing is not None:
+        routing.replica = alias
+
+
+def read_from_primary():
+    set_request_replica(None)
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the request, writes to primary.
+
+    Outside requests marked for replica reads (management commands, most
+    views) everything goes to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or model._meta.app_label in PRIMARY_APPS:
+            return None
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
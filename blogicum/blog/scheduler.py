@@ -0,0 +1,103 @@
+import heapq
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import (
+    adjust_post_counts, bump_post_feeds, bump_post_page, make_post_state
+)
+from .home_feed import invalidate_home_feed
+from .models import Post, PostVisibility
+
+logger = logging.getLogger(__name__)
+
+
+def publish_due_posts():
+    """Make published posts whose time has come visible; return how many.
+
+    Each post is opened by a conditional UPDATE, so concurrent schedulers and
+    edits of the same posts never open a post twice. Caches are then
+    updated as the post signals would.
+    """
+    with transaction.atomic():
+        due = list(
+            Post.objects
+            .filter(
+                visibility=PostVisibility.SCHEDULED,
+                pub_date__lte=timezone.now(),
+            )
+            .values_list(
+                'pk', 'category__slug', 'category__is_published',
+                'author__username',
+            )
+        )
+        opened = [
+            row for row in due
+            if Post.objects.filter(
+                pk=row[0], visibility=PostVisibility.SCHEDULED
+            ).update(visibility=PostVisibility.VISIBLE)
+        ]
+    for pk, category_slug, category_is_published, username in opened:
+        previous, current = (
+            make_post_state(
+                category_slug, category_is_published, username, visibility
+            )
+            for visibility in (
+                PostVisibility.SCHEDULED, PostVisibility.VISIBLE
+            )
+        )
+        bump_post_page(pk)
+        bump_post_feeds(category_slug, username)
+        adjust_post_counts(previous, current)
+        invalidate_home_feed(previous, current)
+    return len(opened)
+
+
+class PublicationScheduler:
+    """Heap of upcoming publication times, reloaded every ``refresh_interval``.
+
+    Posts scheduled by other processes are picked up on the next reload.
+    """
+
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self.heap = []
+        self.refreshed_at = None
+
+    def refresh(self):
+        self.heap = list(
+            Post.objects
+            .filter(visibility=PostVisibility.SCHEDULED)
+            .order_by('pub_date')
+            .values_list('pub_date', 'pk')
+        )
+        heapq.heapify(self.heap)
+        self.refreshed_at = timezone.now()
+
+    def run_pending(self):
+        now = timezone.now()
+        if (
+            self.refreshed_at is None
+            or (now - self.refreshed_at).total_seconds()
+            >= self.refresh_interval
+        ):
+            self.refresh()
+        if not self.heap or self.heap[0][0] > now:
+            return 0
+        while self.heap and self.heap[0][0] <= now:
+            heapq.heappop(self.heap)
+        published = publish_due_posts()
+        if published:
+            logger.info('Published %s scheduled posts', published)
+        return published
+
+    def seconds_until_next(self):
+        """Seconds to sleep before the next publication or reload."""
+        now = timezone.now()
+        wait = self.refresh_interval - (
+            (now - self.refreshed_at).total_seconds()
+        )
+        if self.heap:
+            wait = min(wait, (self.heap[0][0] - now).total_seconds())
+        return max(wait, 0)
@@ -0,0 +1,154 @@
+import re
+from functools import lru_cache
+
+import snowballstemmer
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from .models import SearchTerm
+
+FTS_TABLE = 'blog_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+russian_stemmer = snowballstemmer.stemmer('russian')
+english_stemmer = snowballstemmer.stemmer('english')
+
+
+@lru_cache(maxsize=10_000)
+def stem(word):
+    if word.isascii():
+        return english_stemmer.stemWord(word)
+    return russian_stemmer.stemWord(word.replace('ё', 'е'))
+
+
+def tokenize(text):
+    return [
+        stem(word)[:SearchTerm.term.field.max_length]
+        for word in WORD_RE.findall(text.lower())
+    ]
+
+
+@lru_cache(maxsize=None)
+def fts5_table_exists(database_name):
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def fts5_enabled():
+    return connection.vendor == 'sqlite' and fts5_table_exists(
+        str(connection.settings_dict['NAME'])
+    )
+
+
+class Fts5Backend:
+
+    def index(self, posts):
+        posts = list(posts)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(post.pk,) for post in posts],
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [
+                    (
+                        post.pk,
+                        ' '.join(tokenize(post.title)),
+                        ' '.join(tokenize(post.text)),
+                    )
+                    for post in posts
+                ],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def matching_ids(self, terms, limit, before=None):
+        match = ' '.join(f'"{term}"' for term in terms)
+        sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        params = [match]
+        if before is not None:
+            sql += ' AND rowid < %s'
+            params.append(before)
+        with connection.cursor() as cursor:
+            cursor.execute(f'{sql} ORDER BY rowid DESC LIMIT %s', [
+                *params, limit
+            ])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class TermTableBackend:
+
+    def index(self, posts):
+        posts = list(posts)
+        SearchTerm.objects.filter(post__in=posts).delete()
+        SearchTerm.objects.bulk_create(
+            SearchTerm(post=post, term=term)
+            for post in posts
+            for term in set(tokenize(f'{post.title} {post.text}'))
+        )
+
+    def remove(self, post_id):
+        SearchTerm.objects.filter(post_id=post_id).delete()
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def matching_ids(self, terms, limit, before=None):
+        matches = SearchTerm.objects.filter(term__in=terms)
+        if before is not None:
+            matches = matches.filter(post_id__lt=before)
+        return list(
+            matches
+            .values('post')
+            .annotate(matched=Count('term'))
+            .filter(matched=len(terms))
+            .order_by('-post')
+            .values_list('post', flat=True)[:limit]
+        )
+
+
+def get_backend():
+    if fts5_enabled():
+        return Fts5Backend()
+    return TermTableBackend()
+
+
+def index_posts(posts):
+    get_backend().index(posts)
+
+
+def remove_post(post_id):
+    get_backend().remove(post_id)
+
+
+def search_posts(queryset, query):
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return queryset.none()
+    # Matches are read newest first in batches and the cap applies to the
+    # posts the reader may see, so hidden matches never push visible ones
+    # out of the results.
+    backend = get_backend()
+    limit = settings.SEARCH_MAX_RESULTS
+    found = []
+    before = None
+    while len(found) < limit:
+        ids = backend.matching_ids(terms, limit, before)
+        found.extend(sorted(
+            queryset.filter(pk__in=ids).values_list('pk', flat=True),
+            reverse=True,
+        ))
+        if len(ids) < limit:
+            break
+        before = ids[-1]
+    return queryset.filter(pk__in=found[:limit])
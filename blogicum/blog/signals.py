@@ -0,0 +1,191 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django_cleanup.signals import cleanup_post_delete
+
+from .cache import (
+    adjust_post_counts, bump_feed_generation, bump_post_feeds, bump_post_page,
+    feed_scope, get_post_feed_keys, get_post_state, make_post_state
+)
+from .home_feed import bump_home_feed_version, invalidate_home_feed
+from .images import delete_variants
+from .jobs import enqueue_image_job
+from .lookups import bump_lookup_version
+from .models import Category, Comment, Location, Post, PostVisibility
+from .search import index_posts, remove_post
+from .utils import update_author_stats
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+def bump_profile_feed(user_id):
+    # The profile shows the user's stats, which comments elsewhere change.
+    username = (
+        User.objects
+        .filter(pk=user_id)
+        .values_list('username', flat=True)
+        .first()
+    )
+    if username:
+        bump_feed_generation(feed_scope(author__username=username))
+
+
+@receiver(post_save, sender=Comment)
+def record_comment_activity(sender, instance, created, raw, **kwargs):
+    if not raw:
+        update_author_stats(instance.author_id, comment_count=int(created))
+        bump_profile_feed(instance.author_id)
+
+
+@receiver(post_delete, sender=Comment)
+def forget_comment_activity(sender, instance, **kwargs):
+    update_author_stats(instance.author_id, touch=False, comment_count=-1)
+    bump_profile_feed(instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_feeds(sender, instance, raw=False, **kwargs):
+    if raw:
+        bump_feed_generation()
+        return
+    bump_post_page(instance.post_id)
+    feed_keys = get_post_feed_keys(instance.post_id)
+    if feed_keys:
+        bump_post_feeds(*feed_keys)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, raw, **kwargs):
+    instance._previous_state = None
+    if not raw and instance.pk is not None:
+        instance._previous_state = get_post_state(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, signal, raw=False, **kwargs):
+    if raw:
+        bump_feed_generation()
+        bump_home_feed_version()
+        return
+    bump_post_page(instance.pk)
+    previous_state = getattr(instance, '_previous_state', None)
+    if previous_state:
+        bump_post_feeds(*previous_state[:2])
+    category = instance.category if instance.category_id else None
+    state = make_post_state(
+        category and category.slug,
+        category and category.is_published,
+        instance.author.username,
+        instance.visibility,
+    )
+    bump_post_feeds(*state[:2])
+    if signal is post_delete:
+        previous_state, state = state, None
+    adjust_post_counts(previous_state, state)
+    invalidate_home_feed(previous_state, state)
+
+
+@receiver(post_save, sender=Post)
+def record_post_activity(sender, instance, created, raw, **kwargs):
+    # A post moved to another author in the admin is counted for the new
+    # one only after rebuild_author_stats.
+    if not raw:
+        update_author_stats(instance.author_id, post_count=int(created))
+
+
+@receiver(post_delete, sender=Post)
+def forget_post_activity(sender, instance, **kwargs):
+    update_author_stats(instance.author_id, touch=False, post_count=-1)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, **kwargs):
+    bump_feed_generation()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_lookup_tables(sender, **kwargs):
+    # Bumped again after commit, in case another process reloaded the
+    # tables before the change became visible to it.
+    bump_lookup_version()
+    transaction.on_commit(bump_lookup_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_feeds(sender, instance, created, update_fields,
+                             **kwargs):
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    bump_feed_generation()
+
+
+@receiver(pre_save, sender=Post)
+def set_post_visibility(sender, instance, **kwargs):
+    # Posts scheduled for later are opened by publish_scheduled_posts.
+    instance.visibility = PostVisibility.of(
+        instance.is_published, instance.pub_date
+    )
+
+
+@receiver(pre_save, sender=Post)
+def touch_post(sender, instance, raw, **kwargs):
+    if not raw:
+        instance.updated_at = timezone.now()
+
+
+@receiver(pre_save, sender=Post)
+def track_image_upload(sender, instance, raw, **kwargs):
+    instance._image_uploaded = (
+        not raw and bool(instance.image) and not instance.image._committed
+    )
+    if instance._image_uploaded or not instance.image:
+        instance.has_image_variants = False
+
+
+@receiver(post_save, sender=Post)
+def queue_image_variants(sender, instance, **kwargs):
+    if getattr(instance, '_image_uploaded', False):
+        instance._image_uploaded = False
+        enqueue_image_job(instance)
+
+
+@receiver(cleanup_post_delete, sender=Post)
+def delete_image_variants(sender, field_name, file_name, file, **kwargs):
+    if field_name == 'image':
+        delete_variants(file_name, file.storage)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    remove_post(instance.pk)
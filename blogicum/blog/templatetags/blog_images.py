@@ -0,0 +1,21 @@
+from django import template
+from django.conf import settings
+
+from blog.images import get_formats, get_srcset, get_variant_name
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post):
+    context = {'post': post, 'src': post.image.url, 'srcsets': {}}
+    if post.has_image_variants:
+        smallest = next(iter(settings.POST_IMAGE_VARIANTS))
+        context['src'] = post.image.storage.url(
+            get_variant_name(post.image.name, smallest, 'jpeg')
+        )
+        context['srcsets'] = {
+            image_format: get_srcset(post.image, image_format)
+            for image_format in get_formats()
+        }
+    return context
@@ -1,11 +1,22 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('api/posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path('api/posts/<int:pk>/',
+         api.PostDetailApiView.as_view(),
+         name='api_post_detail'),
+    path('api/posts/<int:pk>/comments/',
+         api.PostCommentListApiView.as_view(),
+         name='api_post_comments'),
+    path('feed/', views.PostFeedView.as_view(), name='feed'),
+    path('feed/atom/',
+         views.PostFeedView.as_view(feed_class=feeds.LatestPostsAtomFeed),
+         name='feed_atom'),
     path('posts/<int:pk>/',
          views.PostDetailView.as_view(),
          name='post_detail'),
@@ -19,12 +30,36 @@ urlpatterns = [
     path('profile/edit/',
          views.ProfileUpdateView.as_view(),
          name='edit_profile'),
+    path('profile/<str:username>/feed/',
+         views.ProfilePostFeedView.as_view(),
+         name='profile_feed'),
+    path('profile/<str:username>/feed/atom/',
+         views.ProfilePostFeedView.as_view(
+             feed_class=feeds.AuthorPostsAtomFeed
+         ),
+         name='profile_feed_atom'),
     path('profile/<str:username>/',
          views.ProfileDetailView.as_view(),
          name='profile'),
+    path('stats/requests/',
+         views.RequestStatsView.as_view(),
+         name='request_stats'),
+    path('export/<str:kind>/', views.ExportView.as_view(), name='export'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    path('category/<slug:category_slug>/feed/',
+         views.CategoryPostFeedView.as_view(),
+         name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         views.CategoryPostFeedView.as_view(
+             feed_class=feeds.CategoryPostsAtomFeed
+         ),
+         name='category_feed_atom'),
     path('category/<slug:category_slug>/',
          views.CategoryPostListView.as_view(),
          name='category_posts'),
+    path('posts/<int:pk>/comments/',
+         views.PostCommentListView.as_view(),
+         name='post_comments'),
     path('posts/<int:pk>/comment/',
          views.CommentCreateView.as_view(),
          name='add_comment'),
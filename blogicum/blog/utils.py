@@ -1,14 +1,22 @@
-from .models import Post
+import json
+import re
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import AuthorStats, Comment, Post, PostVisibility
+
+User = get_user_model()
 
 
 def get_base_posts_query():
     return (
-        Post.objects.select_related(
-            'author',
-            'location',
-            'category'
-        )
-        .prefetch_related('comments')
+        Post.objects.select_related('author')
+        .with_lookups()
         .only(
             'title',
             'text',
@@ -17,12 +25,141 @@ def get_base_posts_query():
             'location',
             'category',
             'image',
+            'has_image_variants',
             'is_published',
-            'category__is_published',
-            'category__slug',
-            'category__title',
-            'location__is_published',
-            'location__name',
+            'updated_at',
+            'comment_count',
             'author__username',
         )
     )
+
+
+def rebuild_comment_counts():
+    counts = (
+        Comment.objects
+        .filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Post.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+def refresh_post_visibility():
+    """Set ``visibility`` on posts written without the model signals."""
+    now = timezone.now()
+    updated = 0
+    for visibility, condition in (
+        (PostVisibility.HIDDEN, Q(is_published=False)),
+        (PostVisibility.SCHEDULED, Q(is_published=True, pub_date__gt=now)),
+        (PostVisibility.VISIBLE, Q(is_published=True, pub_date__lte=now)),
+    ):
+        updated += (
+            Post.objects
+            .filter(condition)
+            .exclude(visibility=visibility)
+            .update(visibility=visibility)
+        )
+    return updated
+
+
+def aggregate_by_author(model, aggregate):
+    return Subquery(
+        model.objects
+        .filter(author=OuterRef('pk'))
+        .order_by()
+        .values('author')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+def rebuild_author_stats(user_ids=None, batch_size=1000):
+    users = User.objects.all()
+    stats = AuthorStats.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+    rows = users.annotate(
+        post_count=Coalesce(aggregate_by_author(Post, Count('pk')), 0),
+        comment_count=Coalesce(aggregate_by_author(Comment, Count('pk')), 0),
+        last_post_at=aggregate_by_author(Post, Max('updated_at')),
+        last_comment_at=aggregate_by_author(Comment, Max('pub_date')),
+    ).values_list(
+        'pk', 'post_count', 'comment_count', 'last_post_at', 'last_comment_at'
+    )
+    created = 0
+    with transaction.atomic():
+        stats.delete()
+        for batch in batched(rows.iterator(), batch_size):
+            AuthorStats.objects.bulk_create(
+                [
+                    AuthorStats(
+                        user_id=user_id,
+                        post_count=post_count,
+                        comment_count=comment_count,
+                        last_activity_at=max(
+                            filter(None, activity), default=None
+                        ),
+                    )
+                    for user_id, post_count, comment_count, *activity in batch
+                ],
+                ignore_conflicts=True,
+            )
+            created += len(batch)
+    return created
+
+
+def update_author_stats(user_id, touch=True, **deltas):
+    """Add ``deltas`` to the user's counters, marking activity if ``touch``.
+
+    A missing row is built from scratch on the user's next activity, not on
+    deletions, which may come from the user being deleted.
+    """
+    updates = {
+        field: Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items()
+    }
+    if touch:
+        updates['last_activity_at'] = timezone.now()
+    updated = AuthorStats.objects.filter(user_id=user_id).update(**updates)
+    if not updated and touch:
+        rebuild_author_stats([user_id])
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+JSON_SEPARATORS_RE = re.compile(r'[\s,\[\]]*')
+
+
+def iter_json_array(file, chunk_size=1 << 16):
+    """Yield the items of a JSON array from a text file one at a time.
+
+    Only the current chunk and a partially read item are kept in memory, so
+    fixtures of any size can be read.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while True:
+        chunk = file.read(chunk_size)
+        buffer += chunk
+        position = 0
+        while True:
+            position = JSON_SEPARATORS_RE.match(buffer, position).end()
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            yield item
+        buffer = buffer[position:]
+        if not chunk:
+            break
+    if buffer:
+        raise ValueError(f'Invalid JSON near: {buffer[:80]!r}')
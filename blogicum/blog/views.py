@@ -1,67 +1,97 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import urlencode
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, UpdateView, View
 )
 
+from .cache import feed_scope, get_feed_generations
+from .export import EXPORTS, FORMATS, export_content
+from .feeds import AuthorPostsFeed, CategoryPostsFeed, LatestPostsFeed
 from .forms import CommentCreateForm, PostCreateForm
+from .home_feed import HomeFeedPosts
+from .lookups import get_category_by_slug
+from .middleware import request_stats
 from .mixins import (
-    CommentDispatchSuccessMixin, CommentMixin, PostDispatchMixin, PostMixin
+    CachedCountPaginationMixin, CommentDispatchSuccessMixin, CommentMixin,
+    CommentPageMixin, ConditionalGetMixin,
+    CursorPaginationMixin, FeedPageCacheMixin, PostCardMixin,
+    PostDispatchMixin, PostMixin, StaffRequiredMixin
 )
-from .models import Category, Comment, Post
+from .models import AuthorStats, Post
+from .search import search_posts
 from .utils import get_base_posts_query
 
 User = get_user_model()
 
 
-class PostListView(ListView):
+class PostListView(
+    ConditionalGetMixin, FeedPageCacheMixin, PostCardMixin,
+    CursorPaginationMixin, CachedCountPaginationMixin, ListView
+):
     model = Post
+    read_from_replica = True
     template_name = 'blog/index.html'
     paginate_by = settings.PAGE_SIZE
-    queryset = (
-        get_base_posts_query()
-        .filter(
-            category__is_published=True,
-            is_published=True,
-            pub_date__lte=timezone.now(),
+
+    def get_queryset(self):
+        return get_base_posts_query().published()
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            HomeFeedPosts(queryset), per_page, **kwargs
         )
-    )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, CommentPageMixin, DetailView):
+    # Renders with two queries: the post joined with its author, and the
+    # first page of its comments joined with their authors. The category
+    # and location come from the lookup tables.
     model = Post
+    read_from_replica = True
     template_name = 'blog/detail.html'
 
+    def get_condition_versions(self):
+        return get_feed_generations(feed_scope(post_id=self.kwargs['pk']))
+
     def get_queryset(self):
-        post = get_object_or_404(Post, pk=self.kwargs['pk'])
-        queryset = get_base_posts_query()
-        if self.request.user.id != post.author.id:
-            queryset = (
-                queryset
-                .filter(
-                    category__is_published=True,
-                    is_published=True,
-                    pub_date__lte=timezone.now(),
-                )
-            )
-        return queryset
+        return get_base_posts_query().visible_to(self.request.user)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = (
-            Comment.objects
-            .prefetch_related('author')
-            .filter(post__id=self.kwargs['pk'])
-            .defer('post')
-        )
+        context['comments'] = self.get_comments_page(self.object.pk)
         context['form'] = CommentCreateForm()
         return context
 
 
+class PostCommentListView(ConditionalGetMixin, CommentPageMixin, DetailView):
+    """Next page of a post's comments, rendered without the page around it.
+
+    The post detail page loads these pages as the reader asks for more.
+    """
+
+    model = Post
+    template_name = 'includes/comment_list.html'
+    comments_cursor_parameter = 'after'
+
+    def get_condition_versions(self):
+        return get_feed_generations(feed_scope(post_id=self.kwargs['pk']))
+
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).only('pk')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = self.get_comments_page(self.object.pk)
+        return context
+
+
 class PostCreateView(PostMixin, LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
@@ -85,29 +115,54 @@ class PostDeleteView(
         return context
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(
+    ConditionalGetMixin, FeedPageCacheMixin, PostCardMixin,
+    CursorPaginationMixin, CachedCountPaginationMixin, ListView
+):
     model = Post
+    read_from_replica = True
     template_name = 'blog/profile.html'
     paginate_by = settings.PAGE_SIZE
 
+    def get_feed_filter(self):
+        return {'author__username': self.kwargs['username']}
+
+    def get_count_audience(self):
+        if self.request.user.username == self.kwargs['username']:
+            return 'own'
+        return 'public'
+
     def get_queryset(self):
         return (
             get_base_posts_query()
-            .filter(author__username=self.kwargs['username'])
+            .visible_to(self.request.user)
+            .filter(**self.get_feed_filter())
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = get_object_or_404(
-            User.objects.only(
+            User.objects.select_related('stats').only(
                 'username',
                 'first_name',
                 'last_name',
                 'date_joined',
                 'is_staff',
+                'stats__post_count',
+                'stats__comment_count',
+                'stats__last_activity_at',
             ),
             username=self.kwargs['username']
         )
+        context['stats'] = (
+            getattr(context['profile'], 'stats', None) or AuthorStats()
+        )
+        # AuthorStats counts hidden and scheduled posts too; the number
+        # shown is that of the list below, as this reader sees it.
+        paginator = context['paginator']
+        if not isinstance(paginator, Paginator):
+            paginator = self.get_paginator(self.object_list, self.paginate_by)
+        context['post_count'] = paginator.count
         return context
 
 
@@ -130,30 +185,63 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class CategoryPostListView(ListView):
+class CategoryPostListView(
+    ConditionalGetMixin, FeedPageCacheMixin, PostCardMixin,
+    CursorPaginationMixin, CachedCountPaginationMixin, ListView
+):
     model = Post
+    read_from_replica = True
     template_name = 'blog/category.html'
     paginate_by = settings.PAGE_SIZE
 
+    def get_feed_filter(self):
+        return {'category__slug': self.kwargs['category_slug']}
+
+    def get_category(self):
+        category = get_category_by_slug(self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404
+        return category
+
     def get_queryset(self):
+        self.category = self.get_category()
         return (
             get_base_posts_query()
-            .filter(
-                category__slug=self.kwargs.get('category_slug'),
-                is_published=True,
-                pub_date__lte=timezone.now(),
-            )
+            .published()
+            .filter(category_id=self.category.pk)
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category.objects.values(
-                'title',
-                'description',
-            ),
-            slug=self.kwargs['category_slug'],
-            is_published=True,
+        context['category'] = self.category
+        return context
+
+
+class PostSearchView(
+    PostCardMixin, CursorPaginationMixin, CachedCountPaginationMixin, ListView
+):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = settings.PAGE_SIZE
+
+    def get_count_key(self):
+        # Search results are capped at SEARCH_MAX_RESULTS and not cached.
+        return None
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(
+            get_base_posts_query().visible_to(self.request.user),
+            self.get_search_query(),
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_search_query()
+        context['pagination_query'] = (
+            urlencode({'q': context['query']}) + '&'
         )
         return context
 
@@ -161,9 +249,12 @@ class CategoryPostListView(ListView):
 class CommentCreateView(CommentMixin, LoginRequiredMixin, CreateView):
     template_name = 'blog/comments.html'
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['pk'])
+        form.instance.post = get_object_or_404(
+            Post.objects.visible_to(self.request.user), pk=self.kwargs['pk']
+        )
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -182,3 +273,54 @@ class CommentDeleteView(
     CommentMixin, CommentDispatchSuccessMixin, LoginRequiredMixin, DeleteView
 ):
     ...
+
+
+class RequestStatsView(StaffRequiredMixin, View):
+
+    def get(self, request):
+        return JsonResponse({
+            'sample_rate': settings.REQUEST_METRICS_SAMPLE_RATE,
+            'views': request_stats.summary(),
+        })
+
+
+class ExportView(StaffRequiredMixin, View):
+
+    def get(self, request, kind):
+        export_format = request.GET.get('format', 'ndjson')
+        if kind not in EXPORTS or export_format not in FORMATS:
+            raise Http404
+        response = StreamingHttpResponse(
+            export_content(
+                kind,
+                export_format,
+                author=request.GET.get('author'),
+                category=request.GET.get('category'),
+            ),
+            content_type=f'{FORMATS[export_format]}; charset=utf-8',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{kind}.{export_format}"'
+        )
+        return response
+
+
+class PostFeedView(ConditionalGetMixin, FeedPageCacheMixin, View):
+    feed_class = LatestPostsFeed
+
+    def get(self, request, *args, **kwargs):
+        return self.feed_class()(request, *args, **kwargs)
+
+
+class CategoryPostFeedView(PostFeedView):
+    feed_class = CategoryPostsFeed
+
+    def get_feed_filter(self):
+        return {'category__slug': self.kwargs['category_slug']}
+
+
+class ProfilePostFeedView(PostFeedView):
+    feed_class = AuthorPostsFeed
+
+    def get_feed_filter(self):
+        return {'author__username': self.kwargs['username']}
@@ -50,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog.middleware.RequestMetricsMiddleware",
+    "blog.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -97,6 +99,26 @@ DATABASES = {
     }
 }
 
+# Aliases in DATABASES of read replicas of "default". GET requests to the
+# post list and detail pages read from one of them, picked per request.
+DATABASE_REPLICAS = []
+# Longest expected replication lag, in seconds. After a change to a feed, or
+# after a client writes anything, reads stay on the primary this long.
+DATABASE_REPLICA_LAG = 5
+DATABASE_ROUTERS = ["blog.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Use a shared backend (Redis, Memcached) in production so that page cache
+# invalidation reaches every worker process.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -142,6 +164,19 @@ STATICFILES_DIRS = [
 
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Widths in pixels of the resized copies generated for every post image.
+POST_IMAGE_VARIANTS = {
+    "card": 640,
+    "detail": 1280,
+}
+
+# Image copies are made by the process_image_jobs worker. A job taken by a
+# worker that has not finished it within IMAGE_JOB_TIMEOUT seconds is handed
+# to another worker, at most IMAGE_JOB_MAX_ATTEMPTS times.
+IMAGE_JOB_TIMEOUT = 60 * 10
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_CLAIM_WINDOW = 10
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -157,3 +192,63 @@ EMAIL_FILE_PATH = BASE_DIR / "sent_emails/"
 
 MAX_CHAR_COUNT = 20
 PAGE_SIZE = 10
+CURSOR_PAGINATION = False
+# Comments shown on the post page at first and loaded per "show more" click.
+COMMENTS_PAGE_SIZE = 50
+FEED_PAGE_CACHE_TIMEOUT = 60 * 5
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Newest visible posts whose ids are kept in the cache for the index page,
+# so its first HOME_FEED_SIZE / PAGE_SIZE pages are read by primary key.
+HOME_FEED_SIZE = 200
+HOME_FEED_TIMEOUT = 60 * 60
+# Longest time a process keeps its copy of the category and location
+# tables; changes made in the same process reload it at once.
+LOOKUP_TABLES_TIMEOUT = 60
+# Post counts of the paginated lists, also adjusted on every post change.
+POST_COUNT_CACHE_TIMEOUT = 60 * 10
+# Scheduled posts are opened by the publish_scheduled_posts process. While
+# a due post is not yet opened, feed caches last at most
+# SCHEDULED_POST_RECHECK_INTERVAL seconds, since the scheduler's cache
+# changes may not reach this process. A post still hidden
+# SCHEDULED_POST_OVERDUE_WARNING seconds after its time logs a warning.
+SCHEDULED_POST_RECHECK_INTERVAL = 15
+SCHEDULED_POST_OVERDUE_WARNING = 60 * 5
+# Only the newest matches are considered, so broad queries stay fast.
+SEARCH_MAX_RESULTS = 1000
+
+# Share of requests whose query count and timings are measured, reported in
+# the Server-Timing header and the "blog.metrics" log, and kept (the last
+# REQUEST_METRICS_WINDOW per view) for the staff-only request stats page.
+REQUEST_METRICS_SAMPLE_RATE = 0.0
+REQUEST_METRICS_WINDOW = 1000
+
+# Writes the JSON request metrics lines to stderr; Django's default logging
+# drops INFO records.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "metrics": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "metrics": {
+            "class": "logging.StreamHandler",
+            "formatter": "metrics",
+        },
+    },
+    "loggers": {
+        "blog.metrics": {
+            "handlers": ["metrics"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# Rows read from the database and sent to the client at a time by exports.
+EXPORT_CHUNK_SIZE = 2000
+
+# Number of newest posts in the RSS and Atom feeds.
+SYNDICATION_FEED_SIZE = 20
+
+API_PAGE_SIZE = 20
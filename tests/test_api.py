@@ -0,0 +1,78 @@
+import pytest
+from django.test import override_settings
+
+from blog.lookups import get_lookup_tables
+
+
+@pytest.mark.django_db
+def test_api_post_list_sparse_fields(
+        client, post_with_published_location, posts_with_unpublished_category,
+        django_assert_num_queries
+):
+    get_lookup_tables()
+    with django_assert_num_queries(1) as context:
+        response = client.get("/api/posts/?fields=id,title")
+    assert response.status_code == 200
+    assert response.json()["results"] == [{
+        "id": post_with_published_location.id,
+        "title": post_with_published_location.title,
+    }], "Убедитесь, что API возвращает только видимые посты и нужные поля."
+    sql = context.captured_queries[0]["sql"]
+    assert '"blog_post"."text"' not in sql, (
+        "Убедитесь, что API выбирает из базы только запрошенные поля."
+    )
+    assert client.get("/api/posts/?fields=password").status_code == 400
+
+
+@pytest.mark.django_db
+@override_settings(API_PAGE_SIZE=2)
+def test_api_post_list_cursor_pagination(
+        client, many_posts_with_published_locations
+):
+    seen = []
+    url = "/api/posts/?fields=id"
+    while url:
+        data = client.get(url).json()
+        seen.extend(post["id"] for post in data["results"])
+        url = data["next"]
+    assert len(seen) == len(set(seen)) == len(
+        many_posts_with_published_locations
+    ), "Убедитесь, что курсорная пагинация API обходит все посты."
+
+
+@pytest.mark.django_db
+@override_settings(API_PAGE_SIZE=2)
+def test_api_post_detail_with_comments(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    data = client.get(
+        f"/api/posts/{post.id}/?fields=title,category"
+        "&comment_fields=id,author"
+    ).json()
+    assert data["title"] == post.title
+    assert data["category"] == post.category.slug
+    assert [c["id"] for c in data["comments"]["results"]] == [
+        comment.id for comment in comments[:2]
+    ]
+    rest = client.get(data["comments"]["next"]).json()
+    assert [c["id"] for c in rest["results"]] == [comments[2].id]
+    assert rest["results"][0]["author"] == comments[2].author.username
+
+
+@pytest.mark.django_db
+def test_api_hides_invisible_posts(client, posts_with_unpublished_category):
+    post = posts_with_unpublished_category[0]
+    assert client.get(f"/api/posts/{post.id}/").status_code == 404
+    assert client.get(f"/api/posts/{post.id}/comments/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_api_unknown_category_is_empty(user_client, mixer, user):
+    mixer.blend("blog.Post", author=user, category=None)
+    data = user_client.get("/api/posts/?category=no-such-category").json()
+    assert data["results"] == [], (
+        "Убедитесь, что по несуществующей категории API возвращает пустой"
+        " список."
+    )
@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.models import AuthorStats
+
+
+@pytest.mark.django_db
+def test_author_stats_follow_posts_and_comments(
+        mixer, user, another_user, post_with_published_location
+):
+    stats = AuthorStats.objects.get(user=user)
+    assert (stats.post_count, stats.comment_count) == (1, 0)
+
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=another_user
+    )
+    stats.refresh_from_db()
+    assert (stats.post_count, stats.comment_count) == (1, 1), (
+        "Убедитесь, что статистика автора обновляется при добавлении"
+        " комментария."
+    )
+    assert stats.last_activity_at >= comment.pub_date
+
+    post_with_published_location.delete()
+    stats.refresh_from_db()
+    assert (stats.post_count, stats.comment_count) == (0, 0), (
+        "Убедитесь, что статистика автора обновляется при удалении поста"
+        " с комментариями."
+    )
+    assert AuthorStats.objects.get(user=another_user).comment_count == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_author_stats(mixer, user, post_with_published_location):
+    mixer.cycle(2).blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    AuthorStats.objects.all().delete()
+    call_command("rebuild_author_stats")
+    stats = AuthorStats.objects.get(user=user)
+    assert (stats.post_count, stats.comment_count) == (1, 2), (
+        "Убедитесь, что команда rebuild_author_stats пересчитывает"
+        " статистику авторов."
+    )
+    assert stats.last_activity_at is not None
+
+
+@pytest.mark.django_db
+def test_profile_shows_author_stats(
+        client, user_client, mixer, user, post_with_published_location
+):
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = f"/profile/{user.username}/"
+    content = client.get(url).content.decode()
+    assert "Публикаций: 1" in content and "Комментариев: 1" in content, (
+        "Убедитесь, что на странице пользователя выводится его статистика."
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=post_with_published_location.category,
+        is_published=False,
+    )
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    assert "Публикаций: 1" in client.get(url).content.decode(), (
+        "Убедитесь, что другие пользователи видят число только"
+        " опубликованных постов автора."
+    )
+    assert "Комментариев: 2" in client.get(url).content.decode(), (
+        "Убедитесь, что страница пользователя обновляется после его"
+        " комментария."
+    )
+    assert "Публикаций: 2" in user_client.get(url).content.decode(), (
+        "Убедитесь, что автор видит число всех своих постов."
+    )
+
+
+@pytest.mark.django_db
+def test_user_deletion_with_stats(user, post_with_published_location):
+    user.delete()
+    assert not AuthorStats.objects.exists()
+    connection.check_constraints()
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_benchmark_urls_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    call_command(
+        "benchmark_urls",
+        repeat=2,
+        seed_posts=50,
+        seed_comments=200,
+        output=str(report_path),
+    )
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["environment"]["posts"] == 50
+    for name in ("blog:index", "blog:post_detail", "blog:edit_comment",
+                 "pages:about", "pages:rules"):
+        assert name in report["urls"], (
+            f"Убедитесь, что отчёт содержит замеры для адреса `{name}`."
+        )
+    detail = report["urls"]["blog:post_detail"]
+    assert detail["anonymous"]["cold"]["status"] == 200
+    assert detail["anonymous"]["cold"]["queries"] > 0
+    assert detail["author"]["warm"]["median_ms"] > 0
@@ -0,0 +1,40 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 3, (
+        "Убедитесь, что при создании комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+
+    comments[0].delete()
+    Comment.objects.filter(pk=comments[1].pk).delete()
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 1, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_comment_counts(mixer, post_with_published_location):
+    mixer.cycle(2).blend("blog.Comment", post=post_with_published_location)
+    Post.objects.update(comment_count=0)
+
+    call_command("rebuild_comment_counts", stdout=StringIO())
+
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 2, (
+        "Убедитесь, что команда `rebuild_comment_counts` пересчитывает"
+        " количество комментариев."
+    )
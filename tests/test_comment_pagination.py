@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture
+def post_with_comments(mixer, post_with_published_location, another_user):
+    mixer.cycle(5).blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        author=another_user,
+        text=(f"Комментарий {i}" for i in range(5)),
+    )
+    return post_with_published_location
+
+
+def get_fragment_url(content):
+    match = re.search(r'data-comments-url="([^"]+)"', content)
+    return match and match.group(1).replace("&amp;", "&")
+
+
+@pytest.mark.django_db
+@override_settings(COMMENTS_PAGE_SIZE=2)
+def test_post_detail_shows_first_comments(client, post_with_comments):
+    content = client.get(f"/posts/{post_with_comments.id}/").content.decode()
+    assert "Комментарий 0" in content and "Комментарий 1" in content
+    assert "Комментарий 2" not in content, (
+        "Убедитесь, что на странице поста выводится только первая страница"
+        " комментариев."
+    )
+    assert get_fragment_url(content), (
+        "Убедитесь, что на странице поста есть ссылка на следующие"
+        " комментарии."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(COMMENTS_PAGE_SIZE=2)
+def test_comment_fragments_load_remaining_comments(client, post_with_comments):
+    content = client.get(f"/posts/{post_with_comments.id}/").content.decode()
+    seen = []
+    url = get_fragment_url(content)
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        fragment = response.content.decode()
+        assert "<html" not in fragment, (
+            "Убедитесь, что следующие комментарии отдаются без разметки"
+            " страницы."
+        )
+        seen += re.findall(r"Комментарий \d", fragment)
+        url = get_fragment_url(fragment)
+    assert seen == [f"Комментарий {i}" for i in range(2, 5)], (
+        "Убедитесь, что следующие комментарии выводятся по порядку и без"
+        " повторов."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_fragment_not_found(
+        client, post_with_comments, unpublished_posts_with_published_locations
+):
+    unpublished_post = unpublished_posts_with_published_locations[0]
+    assert client.get(
+        f"/posts/{post_with_comments.id}/comments/?after=bad"
+    ).status_code == 404
+    assert client.get(
+        f"/posts/{unpublished_post.id}/comments/"
+    ).status_code == 404, (
+        "Убедитесь, что комментарии к скрытому посту недоступны."
+    )
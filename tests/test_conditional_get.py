@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from django.utils.http import http_date
+
+
+@pytest.mark.django_db
+def test_feed_not_modified(
+        client, mixer, post_with_published_location, django_assert_num_queries
+):
+    response = client.get("/")
+    etag = response["ETag"]
+
+    with django_assert_num_queries(0):
+        response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившаяся лента отдаётся с кодом 304."
+    )
+
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после добавления комментария лента отдаётся заново."
+    )
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    assert client.get(
+        url, HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+
+    post_with_published_location.text = "Новый текст"
+    post_with_published_location.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert "Новый текст" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_change_in_same_second_not_hidden(
+        client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    assert not response.has_header("Last-Modified")
+    post_with_published_location.text = "Новый текст"
+    post_with_published_location.save()
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что страница сверяется только по ETag: дата с точностью"
+        " до секунды скрывает изменения, сделанные в ту же секунду."
+    )
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_user(
+        client, user_client, post_with_published_location
+):
+    url = f"/profile/{post_with_published_location.author.username}/"
+    etag = client.get(url)["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что страница, сохранённая анонимным пользователем, не"
+        " считается актуальной для вошедшего пользователя."
+    )
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.views import PostListView
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def cursor_pagination(monkeypatch):
+    monkeypatch.setattr(PostListView, "cursor_pagination", True)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination_walks_feed(
+        client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+
+    first_page = client.get("/").context["page_obj"]
+    assert list(first_page) == expected[:N_PER_PAGE], (
+        "Убедитесь, что первая страница курсорной пагинации содержит самые"
+        " свежие публикации."
+    )
+    assert first_page.has_next() and not first_page.has_previous()
+
+    second_page = client.get(
+        "/", {"after": first_page.next_cursor}
+    ).context["page_obj"]
+    assert list(second_page) == expected[N_PER_PAGE:N_PER_PAGE * 2], (
+        "Убедитесь, что параметр `after` возвращает следующую страницу ленты."
+    )
+    assert not second_page.has_next() and second_page.has_previous()
+
+    back_page = client.get(
+        "/", {"before": second_page.previous_cursor}
+    ).context["page_obj"]
+    assert list(back_page) == expected[:N_PER_PAGE], (
+        "Убедитесь, что параметр `before` возвращает предыдущую страницу"
+        " ленты."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination_rejects_bad_token(client):
+    response = client.get("/", {"after": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что при неверном курсоре страница возвращает ошибку 404."
+    )
@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_edit_post_fetches_post_once(
+        user_client, post_with_published_location, django_assert_num_queries
+):
+    # Session, user, a single post lookup and the category and location
+    # choices of the form.
+    with django_assert_num_queries(5):
+        response = user_client.get(
+            f"/posts/{post_with_published_location.id}/edit/"
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_delete_comment_fetches_comment_once(
+        user_client, mixer, user, post_with_published_location,
+        django_assert_num_queries
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    # Session, user and a single comment lookup.
+    with django_assert_num_queries(3):
+        response = user_client.get(
+            f"/posts/{post_with_published_location.id}"
+            f"/delete_comment/{comment.id}/"
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_edit_post_of_another_author_redirects(
+        another_user_client, post_with_published_location
+):
+    response = another_user_client.get(
+        f"/posts/{post_with_published_location.id}/edit/"
+    )
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post_with_published_location.id}/"
@@ -0,0 +1,51 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_export_posts_ndjson(
+        post_with_published_location, post_of_another_author
+):
+    output = StringIO()
+    call_command(
+        "export_content", "posts",
+        author=post_with_published_location.author.username,
+        stdout=output,
+    )
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [row["id"] for row in rows] == [post_with_published_location.id], (
+        "Убедитесь, что выгрузка фильтруется по автору."
+    )
+    assert rows[0]["title"] == post_with_published_location.title
+
+
+@pytest.mark.django_db
+def test_export_comments_csv(mixer, post_with_published_location):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    output = StringIO()
+    call_command("export_content", "comments", format="csv", stdout=output)
+    rows = list(csv.DictReader(StringIO(output.getvalue())))
+    assert len(rows) == 3
+    assert {row["post_id"] for row in rows} == {
+        str(post_with_published_location.id)
+    }
+
+
+@pytest.mark.django_db
+def test_export_endpoint_staff_only(
+        user_client, admin_client, post_with_published_location
+):
+    url = "/export/posts/?format=csv"
+    assert user_client.get(url).status_code == 403, (
+        "Убедитесь, что выгрузка недоступна обычным пользователям."
+    )
+    response = admin_client.get(url)
+    assert response.status_code == 200
+    assert response.streaming
+    content = b"".join(response.streaming_content).decode()
+    assert post_with_published_location.title in content
+    assert admin_client.get("/export/users/").status_code == 404
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.cache import get_feed_page_timeout
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_served_from_cache(
+        client, post_with_published_location, django_assert_num_queries
+):
+    client.get("/")
+    with django_assert_num_queries(0):
+        response = client.get("/")
+    assert post_with_published_location.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_cache_invalidated_by_comment(
+        client, mixer, post_with_published_location
+):
+    category_url = (
+        f"/category/{post_with_published_location.category.slug}/"
+    )
+    profile_url = (
+        f"/profile/{post_with_published_location.author.username}/"
+    )
+    for url in ("/", category_url, profile_url):
+        assert "Комментарии (0)" in client.get(url).content.decode()
+
+    mixer.blend("blog.Comment", post=post_with_published_location)
+
+    for url in ("/", category_url, profile_url):
+        assert "Комментарии (1)" in client.get(url).content.decode(), (
+            "Убедитесь, что кеш страниц ленты сбрасывается при добавлении"
+            " комментария."
+        )
+
+
+@pytest.mark.django_db
+def test_feed_cache_skips_logged_in_users(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None, (
+        "Убедитесь, что страницы для авторизованных пользователей не"
+        " берутся из кеша."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(FEED_PAGE_CACHE_TIMEOUT=600)
+def test_feed_cache_expires_at_next_publication(
+        mixer, user, published_category
+):
+    assert get_feed_page_timeout() == 600
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=90),
+    )
+    assert 89 <= get_feed_page_timeout() <= 90, (
+        "Убедитесь, что кеш ленты истекает к моменту выхода ближайшей"
+        " отложенной публикации."
+    )
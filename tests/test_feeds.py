@@ -0,0 +1,47 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_feeds_list_visible_posts(
+        client, post_with_published_location, posts_with_unpublished_category
+):
+    post = post_with_published_location
+    for url in (
+        "/feed/",
+        "/feed/atom/",
+        f"/category/{post.category.slug}/feed/",
+        f"/profile/{post.author.username}/feed/atom/",
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert post.title in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные посты."
+        )
+        for hidden in posts_with_unpublished_category:
+            assert hidden.title not in content
+    assert client.get("/feed/atom/")["Content-Type"].startswith(
+        "application/atom+xml"
+    )
+    assert client.get("/category/no-such-category/feed/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_cached_until_post_changes(
+        client, post_with_published_location, django_assert_num_queries
+):
+    response = client.get("/feed/")
+    etag = response["ETag"]
+    with django_assert_num_queries(0):
+        assert client.get("/feed/").content == response.content
+        assert client.get(
+            "/feed/", HTTP_IF_NONE_MATCH=etag
+        ).status_code == 304
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "Новый заголовок" in response.content.decode(), (
+        "Убедитесь, что лента обновляется после изменения публикации."
+    )
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import home_feed
+from blog.home_feed import build_home_feed, get_home_feed
+from blog.views import PostListView
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(1, 6)),
+    )
+
+
+def get_index_ids(client, url="/"):
+    return [post.id for post in client.get(url).context["page_obj"]]
+
+
+@pytest.mark.django_db
+def test_index_reads_posts_by_id(another_user_client, feed_posts):
+    get_index_ids(another_user_client)
+    with CaptureQueriesContext(connection) as queries:
+        ids = get_index_ids(another_user_client)
+    assert ids == [post.id for post in feed_posts]
+    post_queries = [
+        query["sql"] for query in queries if "blog_post" in query["sql"]
+    ]
+    assert len(post_queries) == 1 and " IN (" in post_queries[0], (
+        "Убедитесь, что первые страницы ленты читаются по первичному ключу"
+        " из предвычисленной ленты."
+    )
+    assert "ORDER BY" not in post_queries[0]
+
+
+@pytest.mark.django_db
+def test_home_feed_follows_post_changes(
+        mixer, another_user_client, feed_posts
+):
+    get_index_ids(another_user_client)
+    new_post = mixer.blend(
+        "blog.Post",
+        author=feed_posts[0].author,
+        category=feed_posts[0].category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(minutes=5),
+    )
+    feed_posts[1].is_published = False
+    feed_posts[1].save()
+    feed_posts[2].delete()
+    entries, complete, _ = get_home_feed()
+    expected = [new_post.id, feed_posts[0].id, feed_posts[3].id,
+                feed_posts[4].id]
+    assert [post_id for _, post_id in entries] == expected, (
+        "Убедитесь, что предвычисленная лента обновляется при публикации,"
+        " снятии с публикации и удалении постов."
+    )
+    assert complete
+    assert get_index_ids(another_user_client) == expected
+
+
+@pytest.mark.django_db
+def test_stale_home_feed_build_is_not_read(
+        mixer, another_user_client, feed_posts, monkeypatch,
+        django_capture_on_commit_callbacks
+):
+    stale_feed = build_home_feed()
+    with django_capture_on_commit_callbacks(execute=True):
+        new_post = mixer.blend(
+            "blog.Post",
+            author=feed_posts[0].author,
+            category=feed_posts[0].category,
+            is_published=True,
+            pub_date=timezone.now(),
+        )
+        # A request that read the posts before the save stores its feed
+        # after the save but before the commit.
+        monkeypatch.setattr(home_feed, "build_home_feed", lambda: stale_feed)
+        get_home_feed()
+        monkeypatch.undo()
+    assert get_index_ids(another_user_client)[0] == new_post.id, (
+        "Убедитесь, что лента, собранная до сохранения поста, не"
+        " используется после фиксации транзакции."
+    )
+
+
+@pytest.mark.django_db
+def test_home_feed_follows_category_visibility(
+        another_user_client, feed_posts
+):
+    get_index_ids(another_user_client)
+    category = feed_posts[0].category
+    category.is_published = False
+    category.save()
+    assert get_index_ids(another_user_client) == []
+
+
+@pytest.mark.django_db
+@override_settings(HOME_FEED_SIZE=2)
+def test_pages_beyond_home_feed(monkeypatch, another_user_client, feed_posts):
+    monkeypatch.setattr(PostListView, "paginate_by", 2)
+    for page in range(1, 4):
+        assert get_index_ids(another_user_client, f"/?page={page}") == [
+            post.id for post in feed_posts[(page - 1) * 2:page * 2]
+        ], (
+            "Убедитесь, что страницы за пределами предвычисленной ленты"
+            " выводятся из базы данных."
+        )
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+
+from blog.models import Category, Comment, Location, Post
+from blog.utils import iter_json_array
+
+
+def test_iter_json_array_reads_in_chunks():
+    data = '[{"a": [1, 2]}, {"b": "], {"}, {"c": null}]'
+    assert list(iter_json_array(StringIO(data), chunk_size=3)) == [
+        {"a": [1, 2]}, {"b": "], {"}, {"c": None}
+    ]
+
+
+@pytest.mark.django_db
+def test_import_fixture(mixer, post_with_published_location, tmp_path):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Comment.objects.update(
+        pub_date=datetime(2020, 1, 1, tzinfo=timezone.utc)
+    )
+    objects = [
+        *Comment.objects.all(), post, post.category, post.location,
+    ]
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(serializers.serialize("json", objects, indent=2))
+    for model in (Comment, Post, Category, Location):
+        model.objects.all().delete()
+
+    call_command(
+        "import_fixture", str(fixture), batch_size=2, stdout=StringIO()
+    )
+
+    imported = Post.objects.get(pk=post.pk)
+    assert imported.title == post.title
+    assert imported.comment_count == 3, (
+        "Убедитесь, что после загрузки фикстуры счётчики комментариев"
+        " пересчитываются."
+    )
+    assert not Comment.objects.exclude(pub_date__year=2020).exists(), (
+        "Убедитесь, что даты комментариев загружаются из фикстуры."
+    )
+
+
+@pytest.mark.django_db
+def test_import_fixture_rolls_back_on_broken_reference(tmp_path):
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(
+        '[{"model": "blog.location", "pk": 1, "fields": {"name": "Город",'
+        ' "is_published": true, "created_at": "2022-12-18T23:03:52Z"}},'
+        ' {"model": "blog.post", "pk": 1, "fields": {"title": "Пост",'
+        ' "text": "Текст", "pub_date": "2022-12-18T23:03:52Z",'
+        ' "author": 999, "is_published": true,'
+        ' "created_at": "2022-12-18T23:03:52Z"}}]'
+    )
+    with pytest.raises(IntegrityError):
+        call_command("import_fixture", str(fixture), stdout=StringIO())
+    assert not Location.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_fixture_reports_invalid_json(tmp_path):
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text('[{"model": "blog.location", "pk": 1, ')
+    with pytest.raises(CommandError):
+        call_command("import_fixture", str(fixture), stdout=StringIO())
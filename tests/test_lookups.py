@@ -0,0 +1,96 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from blog.lookups import get_lookup_tables
+from blog.models import Category, Post
+
+
+@pytest.mark.django_db
+def test_category_page_uses_lookup_tables(
+        client, post_with_published_location, django_assert_num_queries
+):
+    get_lookup_tables()
+    category = post_with_published_location.category
+    # The paginator count, the posts with their authors and the next
+    # scheduled post (for the page cache timeout); no category lookup.
+    with django_assert_num_queries(3):
+        response = client.get(f"/category/{category.slug}/")
+    content = response.content.decode()
+    assert category.title in content
+    assert post_with_published_location.location.name in content
+
+
+@pytest.mark.django_db
+def test_lookup_tables_follow_category_changes(
+        client, post_with_published_location
+):
+    category = post_with_published_location.category
+    assert post_with_published_location.title in (
+        client.get("/").content.decode()
+    )
+
+    category.is_published = False
+    category.save()
+
+    assert post_with_published_location.title not in (
+        client.get("/").content.decode()
+    ), (
+        "Убедитесь, что публикации скрываются сразу после снятия категории"
+        " с публикации."
+    )
+    assert client.get(f"/category/{category.slug}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_visibility_does_not_rely_on_lookup_tables(
+        post_with_published_location
+):
+    get_lookup_tables()
+    # Another process hides the category; its signals do not reach this
+    # process's cache.
+    Category.objects.filter(
+        pk=post_with_published_location.category_id
+    ).update(is_published=False)
+    assert post_with_published_location not in Post.objects.published(), (
+        "Убедитесь, что публикации скрытой категории не выводятся, даже"
+        " если таблицы категорий процесса устарели."
+    )
+
+
+@pytest.mark.django_db
+def test_category_created_elsewhere_is_found(client):
+    get_lookup_tables()
+    Category.objects.bulk_create([Category(
+        title="Новая", description="Описание", slug="new-category",
+        is_published=True,
+    )])
+    assert client.get("/category/new-category/").status_code == 200, (
+        "Убедитесь, что категория, созданная другим процессом, доступна"
+        " без перезапуска сервера."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(LOOKUP_TABLES_TIMEOUT=0)
+def test_lookup_tables_expire(published_category):
+    get_lookup_tables()
+    Category.objects.filter(pk=published_category.pk).update(title="Другое")
+    assert get_lookup_tables().categories[
+        published_category.pk
+    ].title == "Другое"
+
+
+@pytest.mark.django_db
+def test_seed_blog_resets_lookup_tables():
+    version = get_lookup_tables().version
+    call_command(
+        "seed_blog", posts=20, users=2, categories=3, locations=1, seed=1,
+        stdout=StringIO(),
+    )
+    assert get_lookup_tables().version != version
+    assert not Post.objects.published().filter(
+        category__is_published=False
+    ).exists()
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.views import PostListView
+
+
+@pytest.fixture
+def published_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+def get_count(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    counted = any("COUNT(" in query["sql"] for query in queries)
+    return response.context["paginator"].count, counted
+
+
+@pytest.mark.django_db
+def test_post_count_cached(another_user_client, published_posts):
+    post = published_posts[0]
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        assert get_count(another_user_client, url) == (3, True)
+        assert get_count(another_user_client, url) == (3, False), (
+            "Убедитесь, что число постов в ленте берётся из кеша."
+        )
+
+
+@pytest.mark.django_db
+def test_post_count_adjusted_on_publication(
+        mixer, another_user_client, published_posts
+):
+    post = published_posts[0]
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        get_count(another_user_client, url)
+
+    post.is_published = False
+    post.save()
+    for url in urls:
+        assert get_count(another_user_client, url) == (2, False), (
+            "Убедитесь, что число постов в кеше уменьшается при снятии поста"
+            " с публикации."
+        )
+
+    mixer.blend(
+        "blog.Post",
+        author=post.author,
+        category=post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    published_posts[1].delete()
+    for url in urls:
+        assert get_count(another_user_client, url) == (2, False)
+
+
+@pytest.mark.django_db
+def test_own_profile_count_includes_unpublished(
+        user_client, another_user_client, published_posts
+):
+    post = published_posts[0]
+    url = f"/profile/{post.author.username}/"
+    get_count(user_client, url)
+    get_count(another_user_client, url)
+
+    post.is_published = False
+    post.save()
+    assert get_count(user_client, url) == (3, False), (
+        "Убедитесь, что автор видит в своём профиле и снятые с публикации"
+        " посты."
+    )
+    assert get_count(another_user_client, url) == (2, False)
+
+
+@pytest.mark.django_db
+def test_page_range_is_windowed(
+        monkeypatch, mixer, client, user, published_category
+):
+    monkeypatch.setattr(PostListView, "paginate_by", 1)
+    mixer.cycle(20).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    response = client.get("/?page=10")
+    page_links = list(response.context["page_range"])
+    assert page_links == [1, "…", 8, 9, 10, 11, 12, "…", 20], (
+        "Убедитесь, что пагинатор выводит ссылки только на соседние"
+        " страницы и на крайние."
+    )
+    assert "page=15" not in response.content.decode()
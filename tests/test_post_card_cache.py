@@ -0,0 +1,39 @@
+import pytest
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_post_card_cached_by_version(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode()
+
+    Post.objects.filter(pk=post.pk).update(title="Без смены версии")
+    assert post.title in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка публикации берётся из кеша, пока версия"
+        " публикации не изменилась."
+    )
+
+    post.refresh_from_db()
+    post.title = "Новая версия"
+    post.save()
+    assert "Новая версия" in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка публикации перерисовывается после"
+        " изменения публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_refreshed_on_category_change(
+        user_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    user_client.get("/")
+    category.title = "Переименованная категория"
+    category.save()
+    assert category.title in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточки публикаций перерисовываются после"
+        " изменения категории."
+    )
@@ -0,0 +1,37 @@
+import pytest
+
+from blog.lookups import get_lookup_tables
+from conftest import N_PER_FIXTURE
+
+
+@pytest.fixture
+def post_with_comments(mixer, post_with_published_location, another_user):
+    mixer.cycle(N_PER_FIXTURE).blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        author=another_user,
+    )
+    # Categories and locations are loaded once per process, not per page.
+    get_lookup_tables()
+    return post_with_published_location
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count_anonymous(
+        client, post_with_comments, django_assert_num_queries
+):
+    # One query for the post with its author,
+    # one for the comments with their authors.
+    with django_assert_num_queries(2):
+        response = client.get(f"/posts/{post_with_comments.id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count_author(
+        user_client, post_with_comments, django_assert_num_queries
+):
+    # Session and user lookups come on top of the two page queries.
+    with django_assert_num_queries(4):
+        response = user_client.get(f"/posts/{post_with_comments.id}/")
+    assert response.status_code == 200
@@ -0,0 +1,121 @@
+from io import BytesIO
+
+import pytest
+from django.conf import settings
+from django.core.files.images import ImageFile
+from PIL import Image
+
+from blog.images import get_variant_names
+from blog.jobs import claim_image_job, run_image_jobs
+from blog.models import ImageJob
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGB", (2000, 1000), color=(73, 109, 137)).save(
+        img_io, format="PNG"
+    )
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=ImageFile(img_io, name="large_image.png"),
+    )
+
+
+@pytest.fixture
+def processed_post_with_large_image(post_with_large_image):
+    run_image_jobs()
+    return post_with_large_image
+
+
+@pytest.mark.django_db
+def test_image_upload_is_queued(post_with_large_image):
+    post = post_with_large_image
+    post.refresh_from_db()
+    assert not post.has_image_variants, (
+        "Убедитесь, что фото публикации обрабатывается не во время запроса,"
+        " а фоновым обработчиком."
+    )
+    assert ImageJob.objects.filter(
+        post=post, image_name=post.image.name
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_image_job_claimed_once(post_with_large_image):
+    job = claim_image_job()
+    assert job is not None and job.post_id == post_with_large_image.id
+    assert claim_image_job() is None, (
+        "Убедитесь, что одно задание не выдаётся двум обработчикам."
+    )
+
+
+@pytest.mark.django_db
+def test_broken_image_fails_job(post_with_large_image, monkeypatch):
+    def generate_variants(image):
+        raise Image.DecompressionBombError("Слишком большое изображение")
+
+    monkeypatch.setattr("blog.jobs.generate_variants", generate_variants)
+    assert run_image_jobs() == 1, (
+        "Убедитесь, что ошибка обработки фото не останавливает обработчик."
+    )
+    job = ImageJob.objects.get(post=post_with_large_image)
+    assert "DecompressionBombError" in job.error
+    assert job.started_at is None
+    assert claim_image_job() is None, (
+        "Убедитесь, что задание с повреждённым фото не выдаётся повторно."
+    )
+
+
+@pytest.mark.django_db
+def test_unidentified_image_fails_job(post_with_large_image):
+    with post_with_large_image.image.open("wb") as image:
+        image.write(b"not an image")
+    assert run_image_jobs() == 1
+    job = ImageJob.objects.get(post=post_with_large_image)
+    assert "UnidentifiedImageError" in job.error
+    assert claim_image_job() is None, (
+        "Убедитесь, что файл, который не является изображением, не"
+        " обрабатывается повторно."
+    )
+
+
+@pytest.mark.django_db
+def test_image_variants_generated_by_worker(processed_post_with_large_image):
+    post = processed_post_with_large_image
+    post.refresh_from_db()
+    assert not ImageJob.objects.exists()
+    assert post.has_image_variants, (
+        "Убедитесь, что при загрузке фото создаются его уменьшенные копии."
+    )
+    storage = post.image.storage
+    for name in get_variant_names(post.image.name):
+        assert storage.exists(name)
+        with storage.open(name) as variant_file:
+            width = Image.open(variant_file).width
+        assert width in settings.POST_IMAGE_VARIANTS.values()
+
+
+@pytest.mark.django_db
+def test_image_variants_in_srcset(client, processed_post_with_large_image):
+    content = client.get("/").content.decode()
+    post = processed_post_with_large_image
+    for name in get_variant_names(post.image.name):
+        assert name in content, (
+            "Убедитесь, что уменьшенные копии фото перечислены в атрибуте"
+            " `srcset` карточки публикации."
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_image_variants_deleted_with_image(processed_post_with_large_image):
+    post = processed_post_with_large_image
+    storage = post.image.storage
+    names = get_variant_names(post.image.name)
+    post.delete()
+    for name in names:
+        assert not storage.exists(name), (
+            "Убедитесь, что уменьшенные копии фото удаляются вместе с ним."
+        )
@@ -0,0 +1,110 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Category, Post, PostVisibility
+
+REPLICA_TITLE = "Пост только на реплике"
+
+
+@pytest.fixture(scope="module")
+def replica(django_db_setup, django_db_blocker, tmp_path_factory):
+    # A separate SQLite file stands in for a read replica.
+    path = str(tmp_path_factory.mktemp("replica") / "replica.sqlite3")
+    connections.databases["replica"] = {
+        **connections["default"].settings_dict,
+        "NAME": path,
+        "TEST": {"NAME": path},
+    }
+    with django_db_blocker.unblock():
+        call_command("migrate", database="replica", verbosity=0)
+    yield "replica"
+    with django_db_blocker.unblock():
+        connections["replica"].close()
+    del connections.databases["replica"]
+
+
+@pytest.fixture
+def replica_post(replica, user, published_category):
+    User = get_user_model()
+    User.objects.using(replica).bulk_create(
+        [User(pk=user.pk, username=user.username)]
+    )
+    Category.objects.using(replica).bulk_create([Category(
+        pk=published_category.pk,
+        title=published_category.title,
+        slug=published_category.slug,
+        is_published=True,
+    )])
+    Post.objects.using(replica).bulk_create([Post(
+        pk=10**6,
+        title=REPLICA_TITLE,
+        text="Текст",
+        author_id=user.pk,
+        category_id=published_category.pk,
+        pub_date=timezone.now(),
+        visibility=PostVisibility.VISIBLE,
+    )])
+    return Post.objects.using(replica).get(pk=10**6)
+
+
+@pytest.fixture
+def settled_feeds(monkeypatch):
+    # Makes every feed look unchanged for an hour, longer than the lag.
+    now = time.time_ns() + 3600 * 10**9
+    monkeypatch.setattr(
+        "blog.mixins.time", SimpleNamespace(time_ns=lambda: now)
+    )
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_LAG=60)
+def test_pages_read_from_replica(
+        client, replica_post, post_with_published_location, settled_feeds
+):
+    content = client.get("/").content.decode()
+    assert REPLICA_TITLE in content, (
+        "Убедитесь, что лента читается с реплики базы данных."
+    )
+    assert post_with_published_location.title not in content
+    assert client.get(f"/posts/{replica_post.pk}/").status_code == 200
+    assert client.get(
+        f"/api/posts/{replica_post.pk}/"
+    ).status_code == 404, (
+        "Убедитесь, что на реплику направляются только страницы постов."
+    )
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_LAG=60)
+def test_recently_changed_feed_read_from_primary(
+        client, replica_post, post_with_published_location
+):
+    content = client.get("/").content.decode()
+    assert post_with_published_location.title in content, (
+        "Убедитесь, что недавно изменённая лента читается с основной базы."
+    )
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_LAG=60)
+def test_author_reads_own_writes(
+        user_client, replica_post, post_with_published_location,
+        settled_feeds
+):
+    assert REPLICA_TITLE in user_client.get("/").content.decode()
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        data={"text": "Новый комментарий"},
+    )
+    assert "read_primary_until" in response.cookies
+    content = user_client.get("/").content.decode()
+    assert post_with_published_location.title in content, (
+        "Убедитесь, что после записи автор читает данные с основной базы."
+    )
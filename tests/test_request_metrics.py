@@ -0,0 +1,69 @@
+import json
+import logging
+from io import StringIO
+
+import pytest
+from django.test import override_settings
+
+from blog.lookups import get_lookup_tables
+from blog.middleware import request_stats
+
+
+@pytest.fixture(autouse=True)
+def clear_request_stats():
+    request_stats.clear()
+    yield
+    request_stats.clear()
+
+
+@pytest.mark.django_db
+def test_metrics_disabled_by_default(client, post_with_published_location):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert "Server-Timing" not in response, (
+        "Убедитесь, что при выключенной выборке запросы не измеряются."
+    )
+    assert request_stats.summary() == {}
+
+
+@pytest.mark.django_db
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+def test_sampled_request_reports_timings(
+        client, post_with_published_location
+):
+    get_lookup_tables()
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    server_timing = response["Server-Timing"]
+    assert 'desc="2 queries"' in server_timing, (
+        "Убедитесь, что заголовок Server-Timing содержит число запросов к БД."
+    )
+    assert "tpl;dur=" in server_timing and "total;dur=" in server_timing
+    stats = request_stats.summary()["blog:post_detail"]
+    assert stats["count"] == 1
+    assert stats["queries"]["p50"] == 2
+
+
+@pytest.mark.django_db
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+def test_sampled_request_logged(
+        client, post_with_published_location, monkeypatch
+):
+    [handler] = logging.getLogger("blog.metrics").handlers
+    monkeypatch.setattr(handler, "stream", StringIO())
+    client.get(f"/posts/{post_with_published_location.id}/")
+    sample = json.loads(handler.stream.getvalue())
+    assert sample["view"] == "blog:post_detail", (
+        "Убедитесь, что измерения запроса записываются в журнал"
+        " blog.metrics одной строкой JSON."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+def test_request_stats_staff_only(user_client, admin_client):
+    assert user_client.get("/stats/requests/").status_code == 403, (
+        "Убедитесь, что статистика запросов недоступна обычным пользователям."
+    )
+    admin_client.get("/")
+    response = admin_client.get("/stats/requests/")
+    assert response.status_code == 200
+    assert "blog:index" in response.json()["views"]
@@ -0,0 +1,132 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.cache import get_feed_page_timeout
+from blog.models import Post, PostVisibility
+from blog.scheduler import PublicationScheduler, publish_due_posts
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def make_due(post):
+    # Moves the publication time into the past without the model signals,
+    # as the passing of time would.
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+
+
+def get_index_ids(client):
+    return [post.id for post in client.get("/").context["page_obj"]]
+
+
+@pytest.mark.django_db
+def test_feed_filters_on_visibility_only():
+    sql = str(Post.objects.published().query)
+    assert '"visibility" = 2' in sql
+    assert '"pub_date" <=' not in sql, (
+        "Убедитесь, что лента не сравнивает дату публикации с текущим"
+        " временем."
+    )
+
+
+@pytest.mark.django_db
+def test_publish_due_posts(another_user_client, scheduled_post):
+    assert scheduled_post.visibility == PostVisibility.SCHEDULED
+    assert get_index_ids(another_user_client) == []
+    assert publish_due_posts() == 0
+
+    make_due(scheduled_post)
+    assert publish_due_posts() == 1
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.visibility == PostVisibility.VISIBLE
+    assert get_index_ids(another_user_client) == [scheduled_post.id], (
+        "Убедитесь, что отложенная публикация появляется в ленте, как только"
+        " планировщик её откроет."
+    )
+    assert publish_due_posts() == 0
+
+
+@pytest.mark.django_db
+def test_unpublished_post_is_not_opened(scheduled_post):
+    scheduled_post.is_published = False
+    scheduled_post.save()
+    make_due(scheduled_post)
+    assert publish_due_posts() == 0
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.visibility == PostVisibility.HIDDEN
+
+
+@pytest.mark.django_db
+def test_scheduler_waits_for_next_publication(scheduled_post):
+    scheduler = PublicationScheduler(refresh_interval=600)
+    assert scheduler.run_pending() == 0
+    assert 590 <= scheduler.seconds_until_next() <= 600, (
+        "Убедитесь, что планировщик перечитывает расписание не реже"
+        " интервала обновления."
+    )
+
+    make_due(scheduled_post)
+    scheduler.refresh()
+    assert scheduler.seconds_until_next() == 0
+    assert scheduler.run_pending() == 1
+    assert scheduler.heap == []
+
+
+@pytest.mark.django_db
+def test_publish_scheduled_posts_once(capsys, scheduled_post):
+    make_due(scheduled_post)
+    call_command("publish_scheduled_posts", "--once")
+    assert "Открыто публикаций: 1" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_overdue_post_keeps_feed_caches_short(scheduled_post, caplog):
+    make_due(scheduled_post)
+    with override_settings(SCHEDULED_POST_OVERDUE_WARNING=0):
+        timeout = get_feed_page_timeout()
+    assert timeout == settings.SCHEDULED_POST_RECHECK_INTERVAL, (
+        "Убедитесь, что пока планировщик не открыл публикацию, страницы"
+        " ленты кешируются ненадолго."
+    )
+    assert "publish_scheduled_posts" in caplog.text, (
+        "Убедитесь, что просроченная отложенная публикация записывается"
+        " в журнал предупреждением."
+    )
+
+
+@pytest.mark.django_db
+def test_post_opened_by_another_process_appears(
+        client, another_user_client, scheduled_post, monkeypatch
+):
+    make_due(scheduled_post)
+    assert scheduled_post.title not in client.get("/").content.decode()
+    get_index_ids(another_user_client)
+    # The scheduler runs in another process: its cache changes are lost.
+    monkeypatch.setattr("blog.scheduler.bump_post_feeds", lambda *args: None)
+    monkeypatch.setattr(
+        "blog.scheduler.invalidate_home_feed", lambda *args: None
+    )
+    assert publish_due_posts() == 1
+    now = time.time() + settings.SCHEDULED_POST_RECHECK_INTERVAL + 1
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert scheduled_post.title in client.get("/").content.decode(), (
+        "Убедитесь, что публикация, открытая планировщиком в другом"
+        " процессе, появляется на главной странице."
+    )
+    assert scheduled_post.id in get_index_ids(another_user_client)
@@ -0,0 +1,116 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from blog import search
+from blog.models import Post
+
+
+@pytest.fixture(params=["fts5", "term_table"])
+def search_backend(request, monkeypatch):
+    if request.param == "term_table":
+        monkeypatch.setattr(search, "fts5_enabled", lambda: False)
+    else:
+        assert search.fts5_enabled(), "SQLite собран без поддержки FTS5."
+    return request.param
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category, search_backend):
+    return {
+        "cats": mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            title="Мои кошки",
+            text="Публикация о домашних котиках и их привычках.",
+        ),
+        "hidden": mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            title="Черновик про котиков",
+            text="Ещё не опубликовано.",
+            is_published=False,
+        ),
+        "dogs": mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            title="Собаки",
+            text="Прогулки с собакой в парке.",
+        ),
+    }
+
+
+def search_page(client, query):
+    return list(client.get("/search/", {"q": query}).context["page_obj"])
+
+
+@pytest.mark.django_db
+def test_search_finds_word_forms(client, searchable_posts):
+    assert search_page(client, "котики") == [searchable_posts["cats"]], (
+        "Убедитесь, что поиск находит публикации по разным формам слова."
+    )
+    assert search_page(client, "собака парк") == [searchable_posts["dogs"]]
+    assert search_page(client, "собака котик") == []
+
+
+@pytest.mark.django_db
+def test_search_respects_visibility(
+        client, user_client, searchable_posts
+):
+    assert searchable_posts["hidden"] not in search_page(client, "черновик")
+    assert searchable_posts["hidden"] in search_page(user_client, "черновик")
+
+
+@pytest.mark.django_db
+@override_settings(SEARCH_MAX_RESULTS=1)
+def test_hidden_matches_do_not_fill_results(
+        client, mixer, user, published_category, searchable_posts
+):
+    mixer.cycle(2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title="Ещё один черновик про котиков",
+        is_published=False,
+    )
+    assert search_page(client, "котики") == [searchable_posts["cats"]], (
+        "Убедитесь, что скрытые публикации не вытесняют видимые"
+        " из результатов поиска."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_edits(client, searchable_posts):
+    post = searchable_posts["dogs"]
+    post.text = "Теперь здесь про попугаев."
+    post.save()
+    assert search_page(client, "попугай") == [post]
+    assert search_page(client, "парк") == []
+
+    post.delete()
+    assert search_page(client, "попугай") == []
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_index(admin_client, searchable_posts):
+    response = admin_client.get("/admin/blog/post/", {"q": "привычка"})
+    assert list(response.context["cl"].result_list) == [
+        searchable_posts["cats"]
+    ]
+
+
+@pytest.mark.django_db
+def test_seeded_posts_are_indexed(search_backend):
+    call_command(
+        "seed_blog", posts=3, users=1, categories=1, locations=0, seed=1,
+        stdout=StringIO(),
+    )
+    found = search.search_posts(Post.objects.all(), "публикация")
+    assert found.count() == 3, (
+        "Убедитесь, что seed_blog добавляет публикации в поисковый индекс."
+    )
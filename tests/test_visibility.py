@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.scheduler import publish_due_posts
+
+
+@pytest.mark.django_db
+def test_scheduled_post_appears_without_restart(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert post not in client.get("/").context["page_obj"]
+
+    # Time passes without a save: only the scheduler opens the post.
+    Post.objects.filter(pk=post.pk).update(pub_date=timezone.now())
+    assert publish_due_posts() == 1
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что отложенная публикация появляется на главной странице"
+        " после наступления даты публикации без перезапуска сервера."
+    )
+
+
+@pytest.mark.django_db
+def test_visible_to_author_and_others(
+        mixer, user, another_user, published_category
+):
+    hidden = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+    )
+    assert hidden in Post.objects.visible_to(user)
+    assert hidden not in Post.objects.visible_to(another_user)
+    assert hidden not in Post.objects.published()